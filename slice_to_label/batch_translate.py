@@ -32,24 +32,23 @@ def main():
     
     print(f"🎯 发现 {len(json_files)} 个JSON文件需要翻译")
     
-    # 导入翻译函数
-    from src.ai_analyzers import translate_json_file_with_deepseek
+    # 导入批量翻译函数（多个文件合并为一次DeepSeek请求）
+    from src.ai_analyzers import translate_json_files_batch
+    
+    results = translate_json_files_batch(json_files)
     
     success_count = 0
     fail_count = 0
     
-    for i, json_file in enumerate(json_files, 1):
+    for i, (json_file, result) in enumerate(results.items(), 1):
         file_name = os.path.basename(json_file)
-        print(f"\n📋 [{i}/{len(json_files)}] 处理: {file_name}")
-        
-        result = translate_json_file_with_deepseek(json_file)
         
         if result:
             success_count += 1
-            print(f"✅ 翻译成功")
+            print(f"✅ [{i}/{len(json_files)}] 翻译成功: {file_name}")
         else:
             fail_count += 1
-            print(f"❌ 翻译失败")
+            print(f"❌ [{i}/{len(json_files)}] 翻译失败: {file_name}")
     
     print(f"\n🎉 批量翻译完成！")
     print(f"✅ 成功: {success_count} 个文件")
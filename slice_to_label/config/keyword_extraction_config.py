@@ -20,6 +20,8 @@ class KeywordExtractionConfig:
         """初始化配置管理器"""
         self.config_path = config_path or "config/keyword_extraction.json"
         self.keywords_config = self._load_config()
+        # 配置代次：关键词被就地修改时递增，供按配置缓存的派生数据判断是否失效
+        self.generation = 0
         
     def _load_config(self) -> Dict[str, Any]:
         """加载关键词配置，支持文件配置和默认配置"""
@@ -171,6 +173,7 @@ class KeywordExtractionConfig:
         if category in self.keywords_config["keyword_categories"]:
             if language in self.keywords_config["keyword_categories"][category]["keywords"]:
                 self.keywords_config["keyword_categories"][category]["keywords"][language].extend(new_keywords)
+                self.generation += 1
                 logger.info(f"✅ 已更新 {category}-{language} 关键词: {new_keywords}")
     
     def save_config(self):
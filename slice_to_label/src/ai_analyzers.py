@@ -11,13 +11,26 @@
 import os
 import sys
 import json
+import asyncio
+import bisect
 import logging
+import functools
+from types import MappingProxyType
+import hashlib
+import heapq
+import sqlite3
 import tempfile
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 import time
+from collections import Counter
 try:
     import cv2  # type: ignore
     import numpy as np  # type: ignore
@@ -38,9 +51,639 @@ from config.slice_config import (
 
 # 导入统一提示词管理
 from config.prompt_templates import get_unified_prompt, get_prompt_manager
+from config.keyword_extraction_config import get_keyword_config
+
+try:
+    from .keyword_matcher import KeywordMatcher
+    from .json_io import dump_json, load_json
+except ImportError:
+    from keyword_matcher import KeywordMatcher
+    from json_io import dump_json, load_json
+
+# 可选依赖：orjson以C实现JSON读写，缩进输出远快于json.dump(indent=2)
+try:
+    import orjson  # type: ignore
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+# 可选依赖：ijson流式读取，只检查顶层字段时无需构建整个JSON对象树
+try:
+    import ijson  # type: ignore
+    _IJSON_AVAILABLE = True
+except ImportError:
+    _IJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# 模型输出清理用的预编译正则和JSON解码器
+_JSON_DECODER = json.JSONDecoder()
+_BRACKET_QUOTED_VALUE_RE = re.compile(r':\s*\["([^"]+)"\]')
+_BRACKET_VALUE_RE = re.compile(r':\s*\[([^\]]+)\]')
+_WHITESPACE_RE = re.compile(r'\s+')
+# 一次性删除方括号和引号的转换表
+_BRACKET_QUOTE_STRIP_TABLE = str.maketrans('', '', '[]"\'')
+# 一次性删除花括号、方括号和双引号的转换表（文本内容提取预处理）
+_JSON_PUNCT_STRIP_TABLE = str.maketrans('', '', '{}[]"')
+
+# 多图片分析文本解析用的标记和预编译正则
+_MULTI_IMG_MARKER_PREFIX = "### "
+_MULTI_IMG_MARKER_SUFFIXES = ("第一张图片分析", "图片一", "第一组")
+# interaction/scene/emotion字段单次扫描；字段值不含'*'，各字段匹配互不重叠
+_MULTI_FIELD_RE = re.compile(r'\*\*(?P<k>interaction|scene|emotion)\*\*:\s*(?P<v>[^*\n]+)')
+# 各字段值保留所需的最小长度（不含）
+_MULTI_FIELD_MIN_LENGTHS = {'interaction': 2, 'scene': 2, 'emotion': 1}
+# 中文动词模式
+_VERB_RE = re.compile(r'([\u4e00-\u9fa5]{1,2}(?:着|了|过|在|给)*[\u4e00-\u9fa5]{0,2})')
+# 简单动作描述模式（按优先级排列）
+_SIMPLE_ACTION_RES = (
+    re.compile(r'(妈妈|女人|女性|宝宝|工作人员)[^。，]+?(?:展示|逗|抚摸|轻拍|换|喂|喝|准备|交谈|自拍|拍照)[^。，]*'),
+    re.compile(r'(展示|显示)[^。，]*?(产品|奶瓶|奶粉|营养标签)[^。，]*'),
+    re.compile(r'(手持|拿着)[^。，]*?(展示|显示)[^。，]*'),
+)
+_MARKDOWN_MARK_RE = re.compile(r'[#*]+')
+# 关键句子提取的句子分隔符
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?。！？]+')
+
+
+def _has_multi_image_marker(text: str) -> bool:
+    """单次扫描检测多图片分析标记：只在每个"### "处比较后缀，而不是对每个标记各扫一遍全文"""
+    prefix_len = len(_MULTI_IMG_MARKER_PREFIX)
+    idx = text.find(_MULTI_IMG_MARKER_PREFIX)
+    while idx != -1:
+        if text.startswith(_MULTI_IMG_MARKER_SUFFIXES, idx + prefix_len):
+            return True
+        idx = text.find(_MULTI_IMG_MARKER_PREFIX, idx + 1)
+    return False
+
+
+def _truncate(text: str, limit: int, suffix: str = "...") -> str:
+    """超过limit个字符时截断并追加suffix"""
+    return text if len(text) <= limit else text[:limit] + suffix
+
+
+# 统一视为空值的字段内容（小写比较）
+_NULL_TOKENS = frozenset({'无', 'none', 'null', '', '没有', '未知'})
+
+
+def _strip_field_markup(value: str) -> str:
+    """移除字段值中的方括号和引号、各一个首尾逗号，并合并空白"""
+    # 移除各种方括号和引号（单次translate），再各去掉一个首尾逗号（保留内容中的逗号）
+    cleaned = value.translate(_BRACKET_QUOTE_STRIP_TABLE).removeprefix(',').removesuffix(',')
+    # 合并多余的空格；此后首尾已无空白，无需再次strip
+    return _WHITESPACE_RE.sub(' ', cleaned).strip()
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_field_value(value: str) -> str:
+    """统一清理单个字段值的格式：移除方括号和引号、首尾逗号，合并空白，空值归一为'无'（结果按文本缓存）"""
+    cleaned = _strip_field_markup(value)
+    # 🔧 统一处理空值（已是规范值如'无'时免去lower()复制）
+    if cleaned in _NULL_TOKENS or cleaned.lower() in _NULL_TOKENS:
+        return '无'
+    return cleaned
+
+
+# BGR通道的BT.601亮度权重（与cv2.COLOR_BGR2GRAY一致）
+_BGR_LUMA_WEIGHTS = (0.114, 0.587, 0.299)
+
+
+def _score_thumb_stack_numpy(stack, edge_threshold: float):
+    """对(N, H, W) float32灰度缩略图堆叠计算拉普拉斯方差、边缘密度和平均亮度（NumPy向量化实现）"""
+    stack = stack.astype(np.float32, copy=False)
+    
+    # 4邻域拉普拉斯算子，边界按reflect-101填充，与cv2.Laplacian一致
+    padded = np.pad(stack, ((0, 0), (1, 1), (1, 1)), mode="reflect")
+    lap = (
+        padded[:, :-2, 1:-1] + padded[:, 2:, 1:-1] +
+        padded[:, 1:-1, :-2] + padded[:, 1:-1, 2:] -
+        4.0 * stack
+    )
+    laplacian_var = lap.var(axis=(1, 2))
+    # 信息密度：拉普拉斯响应超过阈值的像素比例
+    edge_density = np.mean(np.abs(lap) > edge_threshold, axis=(1, 2))
+    brightness = stack.mean(axis=(1, 2))
+    return laplacian_var, edge_density, brightness
+
+
+# 可选依赖：安装了numba时使用融合内核，单次遍历同时完成三项统计
+try:
+    from numba import njit, prange  # type: ignore
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+if _NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_thumb_stack(stack, edge_threshold):
+        """_score_thumb_stack_numpy的Numba版本：逐帧并行，每个像素只访问一次"""
+        n, h, w = stack.shape
+        laplacian_var = np.empty(n, dtype=np.float64)
+        edge_density = np.empty(n, dtype=np.float64)
+        brightness = np.empty(n, dtype=np.float64)
+        pixels = h * w
+        for k in prange(n):
+            lap_sum = 0.0
+            lap_sq_sum = 0.0
+            pixel_sum = 0.0
+            edges = 0
+            for y in range(h):
+                # reflect-101边界：第-1行取第1行，第h行取第h-2行
+                up = y - 1 if y > 0 else 1
+                down = y + 1 if y < h - 1 else h - 2
+                for x in range(w):
+                    left = x - 1 if x > 0 else 1
+                    right = x + 1 if x < w - 1 else w - 2
+                    center = np.float64(stack[k, y, x])
+                    lap = (np.float64(stack[k, up, x]) + np.float64(stack[k, down, x]) +
+                           np.float64(stack[k, y, left]) + np.float64(stack[k, y, right]) -
+                           4.0 * center)
+                    lap_sum += lap
+                    lap_sq_sum += lap * lap
+                    pixel_sum += center
+                    if abs(lap) > edge_threshold:
+                        edges += 1
+            lap_mean = lap_sum / pixels
+            laplacian_var[k] = lap_sq_sum / pixels - lap_mean * lap_mean
+            edge_density[k] = edges / pixels
+            brightness[k] = pixel_sum / pixels
+        return laplacian_var, edge_density, brightness
+
+    # 导入时预编译，避免首次评分时在请求路径上触发JIT
+    try:
+        _score_thumb_stack(np.zeros((1, 3, 3), dtype=np.float32), 40.0)
+    except Exception as e:
+        logger.warning(f"⚠️ Numba帧评分内核编译失败，使用NumPy实现: {e}")
+        _NUMBA_AVAILABLE = False
+
+
+# DeepSeek API密钥的候选配置文件（按优先级排列），导入时解析一次路径
+_DEEPSEEK_KEY_CONFIG_PATHS = (
+    Path(__file__).parent.parent.parent / "feishu_pool" / ".env",
+    Path(__file__).parent.parent / "config" / "env_config.txt",
+)
+
+
+def _parse_env_file(config_path: Path) -> Dict[str, str]:
+    """把KEY=VALUE格式的配置文件整体解析为字典（去除值两侧的引号）"""
+    values = {}
+    with open(config_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+                value = value[1:-1]
+            values[key.strip()] = value
+    return values
+
+
+# 已找到的DeepSeek API密钥（只缓存成功结果，未找到时下次调用重新查找）
+_deepseek_api_key: Optional[str] = None
+
+
+def _get_deepseek_api_key() -> str:
+    """获取DeepSeek API密钥：优先环境变量，其次配置文件（找到后进程内缓存）"""
+    global _deepseek_api_key
+    if _deepseek_api_key:
+        return _deepseek_api_key
+    
+    api_key = os.getenv("DEEPSEEK_API_KEY")
+    if not api_key:
+        for config_path in _DEEPSEEK_KEY_CONFIG_PATHS:
+            if not config_path.exists():
+                continue
+            try:
+                api_key = _parse_env_file(config_path).get("DEEPSEEK_API_KEY")
+            except Exception as e:
+                logger.warning(f"⚠️ 读取配置文件失败 {config_path}: {e}")
+                continue
+            if api_key:
+                break
+    
+    if not api_key:
+        logger.error("❌ 未找到DeepSeek API密钥")
+        return ""
+    
+    _deepseek_api_key = api_key
+    return api_key
+
+
+def _build_priority_matcher(*groups) -> KeywordMatcher:
+    """
+    按组顺序构建(priority, label)匹配器
+    
+    每组为{keyword: label}或(keywords, label)；组内关键词按声明顺序递增优先级，
+    (keywords, label)形式的整组共用一个优先级（对应原来的any(...)判断）
+    """
+    entries = []
+    priority = 0
+    for group in groups:
+        if isinstance(group, dict):
+            for keyword, label in group.items():
+                entries.append((keyword.lower(), (priority, label)))
+                priority += 1
+        else:
+            keywords, label = group
+            for keyword in keywords:
+                entries.append((keyword.lower(), (priority, label)))
+            priority += 1
+    return KeywordMatcher(entries)
+
+
+# 场景推断关键词：中文优先，其次英文，最后按内容推断；统一在小写文本上单次扫描
+_SCENE_MATCHER = _build_priority_matcher(
+    {
+        '厨房': '家中厨房',
+        '客厅': '家中客厅',
+        '餐厅': '家中餐厅',
+        '卧室': '家中卧室',
+        '医院': '医院环境',
+        '诊所': '医疗场所',
+        '户外': '户外场景',
+        '教室': '室内教室',
+        '办公': '办公环境',
+    },
+    {
+        'kitchen': '家中厨房',
+        'living room': '家中客厅',
+        'bedroom': '家中卧室',
+        'hospital': '医院环境',
+        'clinic': '医疗场所',
+        'outdoor': '户外场景',
+        'classroom': '室内教室',
+        'office': '办公环境',
+    },
+    (['cooking', 'preparing', 'formula', '冲泡', '准备'], '家中厨房'),
+    (['playing', 'dancing', '玩耍', '游戏'], '家中客厅'),
+)
+
+
+def _build_category_matcher(**categories) -> KeywordMatcher:
+    """
+    构建(category, priority, label)匹配器
+    
+    每个类别为{label: keywords}，按声明顺序递增优先级，对应原来的if/elif判断链
+    """
+    entries = []
+    for category, label_keywords in categories.items():
+        for priority, (label, keywords) in enumerate(label_keywords.items()):
+            for keyword in keywords:
+                entries.append((keyword, (category, priority, label)))
+    return KeywordMatcher(entries)
+
+
+# 单场景关键信息：主体/动作/对象，对应_extract_scene_key_info中的判断链
+_SCENE_KEY_INFO_MATCHER = _build_category_matcher(
+    subject={
+        '妈妈': ['妈妈', '女人', '母亲'],
+        '宝宝': ['宝宝', '婴儿', '孩子'],
+        '医生': ['医生', '专家', '护士'],
+        '工作人员': ['工作人员', '教练'],
+        '产品': ['产品', '奶粉', '奶瓶'],
+    },
+    action={
+        '喂养': ['喂', '喝奶', '饮用', '吃'],
+        '护理': ['护理', '抚摸', '轻拍', '照顾', '换尿布'],
+        '互动': ['逗', '互动', '交谈', '玩耍', '拍照'],
+        '展示': ['展示', '显示', '拿着', '手持', '呈现'],
+        '准备': ['冲泡', '准备', '调制', '搅拌'],
+        '情绪': ['哭闹', '哭泣', '笑', '开心', '不安'],
+        '教育': ['教导', '指导', '解释', '演示'],
+        '检查': ['检查', '观察', '查看', '测试'],
+    },
+    object={
+        '奶粉': ['奶粉', '配方奶'],
+        '奶瓶': ['奶瓶'],
+        '产品': ['产品', '包装'],
+        '营养信息': ['营养', '标签'],
+    },
+)
+
+_SCENE_LOCATION_MATCHER = _build_priority_matcher(
+    (['厨房'], '在厨房'),
+    (['客厅'], '在客厅'),
+    (['医院'], '在医院'),
+    (['户外'], '在户外'),
+    (['卧室'], '在卧室'),
+)
+
+# 多场景模式分析：主体/动作类型，对应_analyze_scene_patterns中的判断链
+_SCENE_PATTERN_MATCHER = _build_category_matcher(
+    subject={
+        '妈妈': ['妈妈', '女人', '女性'],
+        '宝宝': ['宝宝', '婴儿'],
+        '工作人员': ['工作人员', '教练'],
+        '产品': ['奶粉', '产品', '包装'],
+    },
+    action={
+        '护理': ['护理', '抚摸', '轻拍', '换尿布', '照顾'],
+        '互动': ['逗', '互动', '交谈', '拍照', '自拍', '玩'],
+        '喂养': ['喝奶', '喂养', '准备奶', '冲泡', '喝'],
+        '展示': ['展示', '显示', '拿着', '手持'],
+        '运动': ['游泳', '水中', '运动', '锻炼'],
+    },
+)
+
+_SCENE_ENVIRONMENT_MATCHER = _build_priority_matcher(
+    (['游泳', '水中'], '游泳馆'),
+    (['厨房'], '厨房'),
+    (['婴儿房', '卧室'], '婴儿房'),
+    (['客厅'], '客厅'),
+)
+
+# 具体性评分：各类别关键词及命中后的加减分（每个类别最多计一次，按声明顺序累加）
+_SPECIFICITY_KEYWORDS = {
+    # 🎯 具体物体词汇
+    'object': [
+        'baby', 'child', 'girl', 'boy', 'mother', 'father', 'toddler',
+        '宝宝', '孩子', '女孩', '男孩', '妈妈', '爸爸', '幼儿', '女人', '人',
+        'bottle', 'milk', 'formula', 'toy', 'book', 'food', 'package', 'product',
+        '奶瓶', '牛奶', '奶粉', '玩具', '书', '食物', '餐具', '包装', '产品', '罐'
+    ],
+    # 🎯 具体动作词汇
+    'action': [
+        'drinking', 'eating', 'playing', 'crying', 'smiling', 'walking', 'sitting',
+        'holding', 'showing', 'displaying', 'preparing',
+        '喝', '吃', '玩', '哭', '笑', '走', '坐', '拿', '放', '看', '听', '展示',
+        '显示', '摆放', '突出', '冲泡', '准备', '递给', '抱着'
+    ],
+    # 🎯 具体场景词汇
+    'place': [
+        'table', 'chair', 'bed', 'sofa', 'kitchen', 'living room', 'hospital',
+        '桌子', '椅子', '床', '沙发', '厨房', '客厅', '医院', '餐桌', '室内', '桌面'
+    ],
+    # 🔧 只惩罚真正通用的词汇
+    'generic': [
+        'video content analysis', 'general content', 'unknown content',
+        '视频内容分析', '通用内容', '未知内容'
+    ],
+    # 🎯 品牌或产品信息
+    'product': [
+        '营养标签', '品牌标识', '奶粉罐', '包装', '标签', '成分', 'logo', 'brand'
+    ],
+}
+_SPECIFICITY_WEIGHTS = (
+    ('object', 0.2),
+    ('action', 0.3),
+    ('place', 0.1),
+    ('generic', -0.2),
+    ('product', 0.2),
+)
+_SPECIFICITY_MATCHER = KeywordMatcher(
+    (keyword, category)
+    for category, keywords in _SPECIFICITY_KEYWORDS.items()
+    for keyword in keywords
+)
+
+# 简单的中文主谓结构检测：主体词与动词同时出现
+_SVO_SUBJECTS = frozenset(["宝宝", "妈妈", "爸爸", "孩子", "婴儿", "产品", "奶粉罐", "包装"])
+_SVO_VERBS = frozenset(["展示", "拿着", "喝", "吃", "玩", "坐", "看", "抱", "喂", "哭", "笑", "制作", "准备"])
+_SVO_ROLES = frozenset(['subject', 'verb'])
+_SVO_MATCHER = KeywordMatcher(
+    [(subj, 'subject') for subj in _SVO_SUBJECTS] +
+    [(verb, 'verb') for verb in _SVO_VERBS]
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_sentence_keyword_matcher(keywords: tuple, case_sensitive: bool) -> KeywordMatcher:
+    """关键句子提取用的关键词匹配器，value为(原关键词, 匹配长度)，按关键词集合缓存"""
+    entries = []
+    for keyword in keywords:
+        keyword_check = keyword if case_sensitive else keyword.lower()
+        entries.append((keyword_check, (keyword, len(keyword_check))))
+    return KeywordMatcher(entries)
+
+
+def _config_generation(keyword_config) -> int:
+    """关键词配置的修改代次（旧版配置对象没有该属性时视为0）"""
+    return getattr(keyword_config, "generation", 0)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_keyword_bundle(keyword_config, generation: int, scenario: str) -> tuple:
+    """
+    按(配置实例, 配置代次, 场景)缓存提取设置、关键词和编译后的正则模式
+    
+    update_keywords()就地修改配置时代次递增，缓存随之失效；
+    提取设置以只读视图返回，调用方共享同一份缓存也不会互相影响
+    """
+    extraction_settings = MappingProxyType(dict(keyword_config.get_extraction_settings()))
+    keywords = tuple(keyword_config.get_keywords_for_extraction(scenario))
+    regex_patterns = tuple(keyword_config.get_regex_patterns())
+    return extraction_settings, keywords, regex_patterns
+
+
+def _get_keyword_bundle(scenario: str) -> tuple:
+    """获取关键句子提取配置；reload_keyword_config()或update_keywords()后自动重新构建"""
+    keyword_config = get_keyword_config()
+    return _build_keyword_bundle(keyword_config, _config_generation(keyword_config), scenario)
+
+
+def _get_fallback_keyword_matcher(keyword_config) -> KeywordMatcher:
+    """获取回退提取用的基础关键词匹配器（随配置代次自动失效）"""
+    return _build_fallback_keyword_matcher(keyword_config, _config_generation(keyword_config))
+
+
+@functools.lru_cache(maxsize=4)
+def _build_fallback_keyword_matcher(keyword_config, generation: int) -> KeywordMatcher:
+    """回退提取用的基础关键词匹配器：高权重类别中每类最多5个词（按配置实例与代次缓存）"""
+    all_keywords = []
+    for category, config in keyword_config.keywords_config["keyword_categories"].items():
+        if config.get("weight", 1.0) >= 1.0:  # 只使用权重>=1.0的类别
+            for keywords in config["keywords"].values():
+                all_keywords.extend(keywords[:5])  # 每类最多5个词
+    return KeywordMatcher((keyword, keyword) for keyword in dict.fromkeys(all_keywords))  # 去重
+
+
+# 相似动作词对（无序）：两段动作分别包含一对中的两个词即视为相似
+_SIMILAR_ACTION_PAIRS = frozenset(frozenset(pair) for pair in [
+    ('喝奶', '喂养'), ('展示', '显示'), ('逗', '互动'),
+    ('抚摸', '轻拍'), ('交谈', '交流'), ('自拍', '拍照')
+])
+_SIMILAR_ACTION_WORD_MATCHER = KeywordMatcher(
+    (word, word) for pair in _SIMILAR_ACTION_PAIRS for word in pair
+)
+
+# 回退关键句子提取：配置加载失败时使用的最小关键词集
+_FALLBACK_BASIC_MATCHER = KeywordMatcher(
+    (keyword, keyword) for keyword in ("宝宝", "妈妈", "baby", "mother")
+)
+
+# 无效切片检测：分析彻底失败、空内容、文件损坏的提示语
+_TRUE_FAILURE_PHRASES = (
+    "analysis completely failed", "处理彻底失败", "无法解析视频", "视频损坏",
+    "fatal error", "严重错误", "complete failure", "total failure"
+)
+_MEANINGLESS_CONTENT = frozenset(["", "无", "none", "null", "N/A", "未知", "unknown"])
+_CORRUPTED_INDICATORS = (
+    "corrupted", "损坏", "无法播放", "文件错误", "format error",
+    "cannot decode", "解码失败", "视频损坏"
+)
+# 忽略大小写的单次扫描正则，免去对整段文本lower()复制
+_TRUE_FAILURE_RE = re.compile('|'.join(map(re.escape, _TRUE_FAILURE_PHRASES)), re.IGNORECASE)
+_CORRUPTED_RE = re.compile('|'.join(map(re.escape, _CORRUPTED_INDICATORS)), re.IGNORECASE)
+
+# 场景总结：行为类型关键词
+_BEHAVIOR_KEYWORDS = {
+    '喂养行为': ('喂', '喝奶', '饮用', '吃', '哺乳'),
+    '护理行为': ('护理', '抚摸', '轻拍', '照顾', '换尿布', '清洁'),
+    '互动行为': ('逗', '互动', '交谈', '玩耍', '拍照', '自拍'),
+    '展示行为': ('展示', '显示', '拿着', '手持', '呈现', '推荐'),
+    '准备行为': ('冲泡', '准备', '调制', '搅拌'),
+    '情绪表达': ('哭闹', '哭泣', '笑', '开心', '不安', '拒绝'),
+    '教育行为': ('教导', '指导', '解释', '演示', '说明'),
+    '检查行为': ('检查', '观察', '查看', '测试', '确认'),
+}
+
+# 场景总结：主体、行为、产品相关性三类关键词合并为一个匹配器，value为(类别, 标签)
+_SUMMARY_SUBJECT_KEYWORDS = {
+    '妈妈': ('妈妈', '女人', '母亲'),
+    '宝宝': ('宝宝', '婴儿', '孩子'),
+    '医生': ('医生', '专家', '护士'),
+    '产品': ('产品', '奶粉', '奶瓶'),
+}
+_PRODUCT_RELEVANCE_KEYWORDS = {
+    '奶粉相关': ('奶粉',),
+    '奶瓶相关': ('奶瓶',),
+    '营养信息': ('营养', '标签'),
+    '产品展示': ('品牌', '产品'),
+}
+_SCENE_SUMMARY_MATCHER = KeywordMatcher(
+    (keyword, (category, label))
+    for category, table in (
+        ('subject', _SUMMARY_SUBJECT_KEYWORDS),
+        ('behavior', _BEHAVIOR_KEYWORDS),
+        ('product', _PRODUCT_RELEVANCE_KEYWORDS),
+    )
+    for label, keywords in table.items()
+    for keyword in keywords
+)
+
+# 场景总结：每个scene只取优先级最高的环境类型（对应原if/elif链）
+_SUMMARY_SCENE_TYPE_MATCHER = _build_priority_matcher(
+    (['厨房'], '厨房环境'),
+    (['客厅'], '客厅环境'),
+    (['医院', '诊所'], '医疗环境'),
+    (['户外'], '户外环境'),
+    (['卧室'], '卧室环境'),
+)
+
+# 情绪趋势关键词
+_POSITIVE_EMOTIONS = frozenset(['开心', '温馨', '愉悦', '满意', '快乐'])
+_NEGATIVE_EMOTIONS = frozenset(['哭闹', '不安', '焦虑', '痛苦', '担心', '拒绝'])
+_NEUTRAL_EMOTIONS = frozenset(['平静', '专注', '中性', '观察', '思考'])
+# 关键词 -> 情绪倾向；一条情绪描述可同时命中多个倾向
+_EMOTION_POLARITY_MATCHER = KeywordMatcher(
+    [(word, 'pos') for word in _POSITIVE_EMOTIONS] +
+    [(word, 'neg') for word in _NEGATIVE_EMOTIONS] +
+    [(word, 'neu') for word in _NEUTRAL_EMOTIONS]
+)
+
+# 情绪推断关键词：中文优先，其次英文
+_EMOTION_MATCHER = _build_priority_matcher(
+    {
+        '哭': '不安',
+        '哭闹': '不安',
+        '开心': '开心',
+        '高兴': '开心',
+        '玩': '开心',
+        '笑': '开心',
+        '专注': '专注',
+        '认真': '专注',
+        '焦虑': '焦虑',
+        '担心': '焦虑',
+    },
+    {
+        'crying': '不安',
+        'happy': '开心',
+        'smiling': '开心',
+        'playing': '开心',
+        'focused': '专注',
+        'worried': '焦虑',
+        'calm': '平静',
+    },
+)
+
+# 动作关键词映射：按声明顺序优先
+_ACTION_KEYWORD_MATCHER = _build_priority_matcher(
+    (['展示', '显示', '拿着', '手持'], '展示'),
+    (['逗', '玩', '互动'], '逗'),
+    (['喝奶', '喂', '喂养'], '喂养'),
+    (['抚摸', '轻拍', '护理', '照顾'], '护理'),
+    (['自拍', '拍照'], '自拍'),
+    (['交谈', '交流', '对话'], '交谈'),
+    (['游泳', '水中', '支撑'], '游泳'),
+    (['准备', '冲泡', '调制'], '准备'),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _infer_scene_from_text(text: str) -> str:
+    """从文本描述中推断场景（支持中英文，结果按文本缓存）"""
+    try:
+        # 单次扫描命中所有关键词，取优先级最高者（中文 > 英文 > 内容推断）
+        return _SCENE_MATCHER.first(text.lower(), default='室内场景')
+        
+    except Exception as e:
+        logger.warning(f"场景推断失败: {e}")
+        return '室内场景'
+
+
+@functools.lru_cache(maxsize=1024)
+def _infer_emotion_from_text(text: str) -> str:
+    """从文本描述中推断情绪（支持中英文，结果按文本缓存）"""
+    try:
+        # 单次扫描命中所有关键词，取优先级最高者（中文 > 英文），默认平静
+        return _EMOTION_MATCHER.first(text.lower(), default='平静')
+        
+    except Exception as e:
+        logger.warning(f"情绪推断失败: {e}")
+        return '平静'
+
+
+@functools.lru_cache(maxsize=256)
+def _format_label_set(labels: frozenset) -> str:
+    """标签集合按排序后逗号连接（常见组合如{'妈妈', '宝宝'}按集合缓存）"""
+    return ', '.join(sorted(labels))
+
+
+def _majority_label(values: List[str], matcher: KeywordMatcher) -> Optional[str]:
+    """
+    把解析出的各字段值映射为标准标签后多数表决（同票取先出现者）
+
+    只统计真正命中关键词的值，全部未命中时返回None，由调用方回退到全文推断
+    """
+    labels = [label for label in (matcher.first(value.lower()) for value in values) if label is not None]
+    if not labels:
+        return None
+    return Counter(labels).most_common(1)[0][0]
+
+
+@functools.lru_cache(maxsize=1024)
+def _extract_action_keywords(interaction: str) -> str:
+    """从interaction中提取关键动作词（结果按文本缓存）"""
+    try:
+        action = _ACTION_KEYWORD_MATCHER.first(interaction)
+        if action is not None:
+            return action
+        
+        # 如果没找到映射，提取主要动词（只需第一个匹配）
+        match = _VERB_RE.search(interaction)
+        if match:
+            return match.group(1)[:4]  # 取前4个字符
+        
+        # 最后回退
+        return _truncate(interaction, 6)
+        
+    except Exception as e:
+        logger.error(f"❌ 动作关键词提取失败: {e}")
+        return interaction[:8]
+
+
 class QwenVideoAnalyzer:
     """Qwen视觉分析器 - 独立实现"""
     
@@ -172,8 +815,7 @@ class QwenVideoAnalyzer:
                 value = value.strip()
                 
                 # 移除方括号和引号
-                value = value.replace('[', '').replace(']', '')
-                value = value.replace('"', '').replace("'", '')
+                value = value.translate(_BRACKET_QUOTE_STRIP_TABLE)
                 
                 # 清理逗号
                 if value.startswith(','):
@@ -182,7 +824,7 @@ class QwenVideoAnalyzer:
                     value = value[:-1]
                 
                 # 清理空格
-                value = ' '.join(value.split())
+                value = _WHITESPACE_RE.sub(' ', value).strip()
                 
                 # 特殊处理
                 if value.lower().strip() in ['无', 'none', 'null', '']:
@@ -196,27 +838,7 @@ class QwenVideoAnalyzer:
     
     def _get_deepseek_api_key(self) -> str:
         """获取DeepSeek API密钥"""
-        try:
-            import os
-            # 首先尝试环境变量
-            api_key = os.getenv("DEEPSEEK_API_KEY")
-            if api_key:
-                return api_key
-            
-            # 然后尝试从配置文件读取
-            config_path = Path(__file__).parent.parent / "config" / "env_config.txt"
-            if config_path.exists():
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.startswith("DEEPSEEK_API_KEY="):
-                            return line.split("=", 1)[1].strip()
-            
-            logger.error("❌ 未找到DeepSeek API密钥")
-            return ""
-            
-        except Exception as e:
-            logger.error(f"❌ 获取DeepSeek API密钥失败: {e}")
-            return ""
+        return _get_deepseek_api_key()
     
     def _extract_frames_optimized(self, video_path: str) -> List:
         """优化的视频帧提取策略 - 针对短视频片段优化"""
@@ -451,6 +1073,15 @@ class QwenVideoAnalyzer:
 class GeminiVideoAnalyzer:
     """Google Gemini 2.5 Pro视觉分析器 - 通过OpenRouter API调用"""
     
+    # 拉普拉斯响应绝对值超过该阈值的像素视为边缘（用于信息密度评分）
+    GEMINI_EDGE_THRESHOLD = 40
+    # dHash汉明距离低于该值（即相似度>0.85）的两帧视为重复
+    GEMINI_MIN_HASH_DISTANCE = 10
+    # 亮度分数低于该值的帧（过暗/过亮）跳过清晰度和边缘计算
+    GEMINI_MIN_BRIGHTNESS_SCORE = 0.2
+    # 长视频分段并行解码的线程数
+    GEMINI_DECODE_WORKERS = 4
+    
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.model_config = get_models_config()["gemini"]
@@ -663,13 +1294,7 @@ class GeminiVideoAnalyzer:
                     return {"success": False, "error": "无法提取视频帧"}
                 
                 # 转换帧为PIL Image格式
-                pil_images = []
-                for frame in frames:
-                    import cv2  # type: ignore
-                    from PIL import Image  # type: ignore
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    pil_image = Image.fromarray(frame_rgb)
-                    pil_images.append(pil_image)
+                pil_images = self._frames_to_pil_images(frames)
                 
                 logger.info(f"📸 Google API准备分析 {len(pil_images)} 个帧")
                 
@@ -738,66 +1363,48 @@ class GeminiVideoAnalyzer:
             
             # 🚀 优化后的Gemini帧提取策略：更全面的覆盖
             if duration <= 2:  # 极短视频：密集采样
-                # 每0.3秒采样一次，确保捕捉所有变化
+                # 每0.3秒采样一次，确保捕捉所有变化，并确保包含最后一帧
                 frame_interval = max(1, int(fps * 0.3))
-                for i in range(0, total_frames, frame_interval):
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        frames.append(frame)
-                # 确保包含最后一帧
+                targets = list(range(0, total_frames, frame_interval))
                 if total_frames > 1:
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, total_frames - 1)
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        frames.append(frame)
-                frames = frames[:6]  # 极短视频最多6帧
+                    targets.append(total_frames - 1)
+                targets = list(dict.fromkeys(targets))[:6]  # 去重，极短视频最多6帧
+                frames.extend(self._read_frames_sequential(cap, targets))
                 
             elif duration <= 8:  # 短视频：关键时刻采样
                 # 更密集的关键时刻点
                 key_positions = [0, 0.15, 0.35, 0.55, 0.75, 0.95]
-                for pos in key_positions:
-                    frame_idx = int(pos * (total_frames - 1))
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        frames.append(frame)
+                targets = sorted(dict.fromkeys(int(pos * (total_frames - 1)) for pos in key_positions))
+                frames.extend(self._read_frames_sequential(cap, targets))
                         
             elif duration <= 20:  # 中等视频：混合策略
-                # 关键时刻 + 内容变化检测
+                # 关键时刻 + 额外采样中间变化点
                 key_positions = [0, 0.2, 0.4, 0.6, 0.8, 1.0]
-                for pos in key_positions:
-                    frame_idx = int(pos * (total_frames - 1))
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        frames.append(frame)
-                        
-                # 额外采样中间变化点
                 mid_points = [0.1, 0.3, 0.5, 0.7, 0.9]
-                for pos in mid_points:
-                    frame_idx = int(pos * (total_frames - 1))
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        frames.append(frame)
+                targets = sorted(dict.fromkeys(
+                    int(pos * (total_frames - 1)) for pos in key_positions + mid_points
+                ))
+                frames.extend(self._read_frames_sequential(cap, targets))
                         
             else:  # 长视频：智能采样
-                # 分段策略：将视频分成8段，每段取代表帧
+                # 分段策略：将视频分成8段，每段取开始、中间、结束三个点
+                # 相邻段的结束点即下一段的开始点，因此每段只负责开始和中间点，最后一段额外负责结尾
                 segments = 8
+                segment_targets = []
                 for i in range(segments):
-                    # 每段取开始、中间、结束三个点
-                    segment_start = i / segments
-                    segment_mid = (i + 0.5) / segments
-                    segment_end = (i + 1) / segments
-                    
-                    for pos in [segment_start, segment_mid, segment_end]:
-                        if pos <= 1.0:
-                            frame_idx = int(pos * (total_frames - 1))
-                            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                            ret, frame = cap.read()
-                            if ret and frame is not None:
-                                frames.append(frame)
+                    positions = [i / segments, (i + 0.5) / segments]
+                    if i == segments - 1:
+                        positions.append(1.0)
+                    segment_targets.append(sorted({int(pos * (total_frames - 1)) for pos in positions}))
+                
+                # 每段使用独立的VideoCapture并行解码（OpenCV解码时会释放GIL）
+                with ThreadPoolExecutor(max_workers=self.GEMINI_DECODE_WORKERS) as executor:
+                    results = list(executor.map(
+                        lambda targets: self._decode_segment(video_path, targets),
+                        segment_targets
+                    ))
+                for segment_frames in results:
+                    frames.extend(segment_frames)
             
             cap.release()
             
@@ -811,111 +1418,170 @@ class GeminiVideoAnalyzer:
             logger.error(f"Gemini帧提取失败: {str(e)}")
             return []
     
+    def _decode_segment(self, video_path: str, targets: List[int]) -> List:
+        """用独立的VideoCapture解码一个时间段内的目标帧：只seek一次，其余顺序读取"""
+        import cv2  # type: ignore
+        if not targets:
+            return []
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if targets[0] > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, targets[0])
+            return self._read_frames_sequential(cap, targets, start=targets[0])
+        except Exception as e:
+            logger.warning(f"⚠️ 分段解码失败 (起始帧 {targets[0]}): {e}")
+            return []
+        finally:
+            cap.release()
+
+    def _read_frames_sequential(self, cap, targets: List[int], start: int = 0) -> List:
+        """按升序帧号顺序解码，非目标帧只grab()不解码，避免反复cap.set()触发关键帧seek
+
+        Args:
+            cap: 已打开的cv2.VideoCapture，当前位置在第start帧
+            targets: 升序排列的目标帧号
+            start: cap当前所在的帧号
+
+        Returns:
+            (原始帧, 灰度缩略图) 元组列表
+        """
+        frames = []
+        cur = start
+        for target in targets:
+            while cur < target:
+                if not cap.grab():
+                    return frames
+                cur += 1
+            if not cap.grab():
+                return frames
+            cur += 1
+            ret, frame = cap.retrieve()
+            if ret and frame is not None:
+                frames.append((frame, self._make_gray_thumbnail(frame)))
+        return frames
+
+    def _make_gray_thumbnail(self, frame):
+        """生成64x64灰度缩略图（float32亮度），供质量评分和相似度计算复用
+
+        先把彩色帧缩小到64x64，再在小图上用BT.601权重做点积得到亮度，
+        避免对整帧做cvtColor。
+        """
+        import cv2  # type: ignore
+        small = cv2.resize(frame, (64, 64), interpolation=cv2.INTER_AREA)
+        weights = np.asarray(_BGR_LUMA_WEIGHTS, dtype=np.float32)
+        return np.einsum('hwc,c->hw', small.astype(np.float32), weights)
+
     def _filter_frames_for_gemini_enhanced(self, frames: List) -> List:
-        """增强版Gemini帧过滤 - 智能选择最有代表性的帧"""
+        """增强版Gemini帧过滤 - 智能选择最有代表性的帧
+
+        Args:
+            frames: (原始帧, 64x64灰度缩略图) 元组列表
+
+        Returns:
+            筛选后的原始帧列表（缩略图不返回给调用方）
+        """
         if not frames:
-            return frames
+            return []
         
-        # 🎯 第一步：质量评估
-        frame_scores = []
-        for i, frame in enumerate(frames):
-            if frame is None or frame.size == 0:
-                continue
-            
-            quality_score = self._calculate_gemini_frame_quality(frame)
-            if quality_score > 0.3:  # 降低质量阈值，保留更多帧
-                frame_scores.append((i, frame, quality_score))
+        # 🎯 第一步：质量评估（所有缩略图堆叠后一次性向量化评分）
+        valid = [(i, frame, thumb) for i, (frame, thumb) in enumerate(frames)
+                 if frame is not None and frame.size > 0]
+        if not valid:
+            return []
+        quality_scores = self._calculate_gemini_frame_quality_batch(
+            np.stack([thumb for _, _, thumb in valid])
+        )
+        
+        passed = [(i, frame, thumb, quality_score)
+                  for (i, frame, thumb), quality_score in zip(valid, quality_scores.tolist())
+                  if quality_score > 0.3]  # 降低质量阈值，保留更多帧
+        
+        # dHash只对64x64缩略图做9x8缩放，逐帧串行计算即可（线程池的创建开销远大于计算本身）
+        frame_scores = [
+            (i, frame, self._compute_dhash(thumb), quality_score)
+            for i, frame, thumb, quality_score in passed
+        ]
         
         if not frame_scores:
-            return [frames[0]] if frames else []
+            return [frames[0][0]]
         
         # 🎯 第二步：多样性选择 - 避免选择过于相似的帧
+        # 按质量从高到低惰性出堆，选满8帧即停止，无需对全部候选排序
         selected_frames = []
-        frame_scores.sort(key=lambda x: x[2], reverse=True)  # 按质量排序
+        heap = [(-score, idx) for idx, (_, _, _, score) in enumerate(frame_scores)]
+        heapq.heapify(heap)
         
-        for i, frame, score in frame_scores:
-            if len(selected_frames) >= 8:  # 🚀 增加到最多8帧
-                break
+        accepted_hashes = []
+        while heap and len(selected_frames) < 8:  # 🚀 增加到最多8帧
+            _, idx = heapq.heappop(heap)
+            _, frame, frame_hash, _ = frame_scores[idx]
                 
-            # 检查与已选择帧的相似度
-            is_similar = False
-            for selected_frame in selected_frames:
-                similarity = self._calculate_frame_similarity(frame, selected_frame)
-                if similarity > 0.85:  # 如果太相似就跳过
-                    is_similar = True
-                    break
+            # 与已选择帧的dHash汉明距离过小（相似度>0.85）就跳过
+            if any((frame_hash ^ accepted).bit_count() < self.GEMINI_MIN_HASH_DISTANCE
+                   for accepted in accepted_hashes):
+                continue
             
-            if not is_similar:
-                selected_frames.append(frame)
+            accepted_hashes.append(frame_hash)
+            selected_frames.append((frame, frame_hash))
         
         # 🎯 第三步：确保时间分布均匀
         if len(selected_frames) < 3 and len(frame_scores) >= 3:
             # 强制选择首、中、尾三帧确保时间覆盖
             indices = [0, len(frame_scores)//2, len(frame_scores)-1]
+            selected_ids = {id(selected) for selected, _ in selected_frames}
             for idx in indices:
-                frame = frame_scores[idx][1]
-                if frame not in selected_frames:
-                    selected_frames.append(frame)
+                _, frame, frame_hash, _ = frame_scores[idx]
+                if id(frame) not in selected_ids:
+                    selected_frames.append((frame, frame_hash))
+                    selected_ids.add(id(frame))
         
         logger.info(f"📊 Gemini帧过滤：{len(frames)}帧 → {len(selected_frames)}帧（多样性选择）")
-        return selected_frames[:8]  # 最终限制为8帧
+        return [frame for frame, _ in selected_frames[:8]]  # 最终限制为8帧
     
-    def _calculate_frame_similarity(self, frame1, frame2) -> float:
-        """计算两帧之间的相似度"""
-        try:
-            import cv2  # type: ignore
-            
-            # 转换为灰度图并调整大小以加速计算
-            gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-            gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
-            
-            # 调整到相同尺寸
-            h, w = 64, 64
-            gray1 = cv2.resize(gray1, (w, h))
-            gray2 = cv2.resize(gray2, (w, h))
-            
-            # 计算直方图相关性
-            hist1 = cv2.calcHist([gray1], [0], None, [256], [0, 256])
-            hist2 = cv2.calcHist([gray2], [0], None, [256], [0, 256])
-            
-            correlation = cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
-            return correlation
-            
-        except Exception as e:
-            logger.warning(f"帧相似度计算失败: {e}")
-            return 0.5
+    def _compute_dhash(self, thumb) -> int:
+        """计算64位差值哈希(dHash)：缩放到9x8后比较相邻像素"""
+        import cv2  # type: ignore
+        small = cv2.resize(thumb, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = np.packbits(small[:, 1:] > small[:, :-1])
+        return int(bits.view(np.uint64)[0])
     
-    def _calculate_gemini_frame_quality(self, frame) -> float:
-        """计算适合Gemini的帧质量分数"""
-        try:
-            import cv2  # type: ignore
-            # 转换为灰度图
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
-            # 清晰度检测（拉普拉斯算子）
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-            sharpness = min(laplacian_var / 1500, 1.0)  # 更高的清晰度要求
-            
-            # 信息密度检测（边缘检测）
-            edges = cv2.Canny(gray, 50, 150)
-            edge_density = np.count_nonzero(edges) / edges.size
-            
-            # 亮度均衡
-            brightness = gray.mean()
-            brightness_score = 1.0 - abs(brightness - 128) / 128
-            
-            # Gemini偏好的综合评分
-            quality = (
-                sharpness * 0.4 +           # 清晰度权重40%
-                edge_density * 0.4 +        # 信息密度权重40%
-                brightness_score * 0.2      # 亮度权重20%
-            )
-            
+    def _calculate_gemini_frame_quality_batch(self, thumbs) -> "np.ndarray":
+        """批量计算适合Gemini的帧质量分数
+
+        Args:
+            thumbs: (N, 64, 64) float32 灰度缩略图堆叠
+
+        Returns:
+            长度为N的质量分数数组
+        """
+        thumbs = np.ascontiguousarray(thumbs, dtype=np.float32)
+        
+        # 亮度均衡：先算亮度，过暗/过亮（转场黑帧、过曝）的帧直接给低分，不再做拉普拉斯
+        brightness = thumbs.mean(axis=(1, 2))
+        brightness_score = 1.0 - np.abs(brightness - 128) / 128
+        quality = brightness_score * 0.2
+        keep = brightness_score >= self.GEMINI_MIN_BRIGHTNESS_SCORE
+        if not keep.any():
             return quality
-            
-        except Exception as e:
-            logger.warning(f"Gemini帧质量计算失败: {e}")
-            return 0.5
+        
+        score_stack = _score_thumb_stack if _NUMBA_AVAILABLE else _score_thumb_stack_numpy
+        laplacian_var, edge_density, _ = score_stack(
+            np.ascontiguousarray(thumbs[keep]), float(self.GEMINI_EDGE_THRESHOLD)
+        )
+        sharpness = np.minimum(laplacian_var / 1500, 1.0)  # 更高的清晰度要求
+        
+        # Gemini偏好的综合评分
+        quality[keep] = (
+            sharpness * 0.4 +               # 清晰度权重40%
+            edge_density * 0.4 +            # 信息密度权重40%
+            brightness_score[keep] * 0.2    # 亮度权重20%
+        )
+        return quality
+
+    def _frames_to_pil_images(self, frames: List) -> List:
+        """BGR帧转PIL Image：用通道翻转视图代替cvtColor，省去一次中间RGB拷贝"""
+        from PIL import Image  # type: ignore
+        return [Image.fromarray(frame[:, :, ::-1]) for frame in frames]
 
     def _call_gemini_frame_fallback(self, video_path: str, prompt: str) -> Dict[str, Any]:
         """回退方法：使用帧分析（保持原有逻辑作为备用）"""
@@ -928,13 +1594,7 @@ class GeminiVideoAnalyzer:
                 return {"success": False, "error": "无法提取视频帧"}
             
             # 转换帧为PIL Image格式
-            pil_images = []
-            for frame in frames:
-                import cv2  # type: ignore
-                from PIL import Image  # type: ignore
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(frame_rgb)
-                pil_images.append(pil_image)
+            pil_images = self._frames_to_pil_images(frames)
             
             # 使用旧版图片分析API
             return self._call_gemini_api_fallback(pil_images, prompt)
@@ -1002,8 +1662,7 @@ class GeminiVideoAnalyzer:
                 value = value.strip()
                 
                 # 移除方括号和引号
-                value = value.replace('[', '').replace(']', '')
-                value = value.replace('"', '').replace("'", '')
+                value = value.translate(_BRACKET_QUOTE_STRIP_TABLE)
                 
                 # 清理逗号
                 if value.startswith(','):
@@ -1012,7 +1671,7 @@ class GeminiVideoAnalyzer:
                     value = value[:-1]
                 
                 # 清理空格
-                value = ' '.join(value.split())
+                value = _WHITESPACE_RE.sub(' ', value).strip()
                 
                 # 特殊处理
                 if value.lower().strip() in ['无', 'none', 'null', '']:
@@ -1026,37 +1685,7 @@ class GeminiVideoAnalyzer:
     
     def _get_deepseek_api_key(self) -> str:
         """获取DeepSeek API密钥"""
-        import os
-        from pathlib import Path
-        
-        # 1. 从环境变量获取
-        api_key = os.getenv("DEEPSEEK_API_KEY")
-        if api_key:
-            return api_key
-        
-        # 2. 从配置文件获取
-        config_paths = [
-            Path(__file__).parent.parent.parent / "feishu_pool" / ".env",
-            Path(__file__).parent.parent / "config" / "env_config.txt"
-        ]
-        
-        for config_path in config_paths:
-            if config_path.exists():
-                try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            if line.strip().startswith('DEEPSEEK_API_KEY='):
-                                api_key = line.split('=', 1)[1].strip()
-                                # 移除引号
-                                if api_key.startswith('"') and api_key.endswith('"'):
-                                    api_key = api_key[1:-1]
-                                elif api_key.startswith("'") and api_key.endswith("'"):
-                                    api_key = api_key[1:-1]
-                                return api_key
-                except Exception:
-                    continue
-        
-        return ""
+        return _get_deepseek_api_key()
 
     def _clean_gemini_raw_output(self, raw_output: str) -> str:
         """清理Gemini原始输出格式，统一格式规范，不进行翻译"""
@@ -1064,47 +1693,31 @@ class GeminiVideoAnalyzer:
             # 基础清理：去除多余空白和换行
             cleaned = raw_output.strip()
             
-            # 尝试提取JSON部分
-            json_match = re.search(r'\{.*\}', cleaned, re.DOTALL)
-            if json_match:
-                cleaned = json_match.group(0)
-            
-            # 🔧 使用统一的字段清理方法
-            def clean_field_format(value):
-                if isinstance(value, str):
-                    # 移除各种方括号和引号
-                    cleaned = value.replace('[', '').replace(']', '')
-                    cleaned = cleaned.replace('"', '').replace("'", '')
-                    if cleaned.startswith(','):
-                        cleaned = cleaned[1:]
-                    if cleaned.endswith(','):
-                        cleaned = cleaned[:-1]
-                    cleaned = ' '.join(cleaned.split())
-                    if cleaned.lower().strip() in ['无', 'none', 'null', '', '没有', '未知']:
-                        return '无'
-                    return cleaned.strip()
-                return value
+            # 定位JSON部分：从第一个'{'开始直接流式解析出第一个完整对象
+            start = cleaned.find('{')
             
             # 解析和重新格式化JSON
             try:
-                import json
-                data = json.loads(cleaned)
+                data, _ = _JSON_DECODER.raw_decode(cleaned, max(start, 0))
                 
-                # 清理所有字段格式
+                # 🔧 使用统一的字段清理方法清理所有字段格式
                 for key, value in data.items():
                     if isinstance(value, str):
-                        data[key] = clean_field_format(value)
+                        data[key] = _clean_field_value(value)
                     elif isinstance(value, list):
-                        data[key] = [clean_field_format(item) if isinstance(item, str) else item for item in value]
+                        data[key] = [_clean_field_value(item) if isinstance(item, str) else item for item in value]
                 
                 # 返回格式化的JSON
                 return json.dumps(data, ensure_ascii=False, separators=(',', ': '))
                 
             except json.JSONDecodeError:
                 logger.warning("⚠️ JSON解析失败，返回文本清理结果")
-                # 如果JSON解析失败，进行文本级别的格式清理
-                cleaned = re.sub(r':\s*\["([^"]+)"\]', r': "\1"', cleaned)  # [content] -> content
-                cleaned = re.sub(r':\s*\[([^\]]+)\]', r': "\1"', cleaned)   # 去除方括号
+                # 如果JSON解析失败，截取首个'{'到最后一个'}'之间的内容做文本级别的格式清理
+                end = cleaned.rfind('}')
+                if start != -1 and end > start:
+                    cleaned = cleaned[start:end + 1]
+                cleaned = _BRACKET_QUOTED_VALUE_RE.sub(r': "\1"', cleaned)  # [content] -> content
+                cleaned = _BRACKET_VALUE_RE.sub(r': "\1"', cleaned)         # 去除方括号
                 return cleaned
                 
         except Exception as e:
@@ -1119,6 +1732,18 @@ class DeepSeekAnalyzer:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.model_config = get_models_config()["deepseek"]
+        
+        # 复用HTTP连接（keep-alive），避免每次调用都重新建立TCP+TLS连接
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        ))
     
     def analyze_text(self, text: str, prompt: str) -> Dict[str, Any]:
         """分析文本内容"""
@@ -1153,12 +1778,7 @@ class DeepSeekAnalyzer:
                 "temperature": self.model_config["temperature"]
             }
             
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self._session.post(url, json=payload, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
@@ -1260,6 +1880,35 @@ class DualStageAnalyzer:
             logger.error(f"视频片段分析失败: {str(e)}")
             return self._get_default_result(f"分析异常: {str(e)}")
     
+    async def analyze_video_slice_async(self, video_path: str, analysis_type: str = "dual") -> Dict[str, Any]:
+        """analyze_video_slice的异步版本：在工作线程中执行（解码为CPU密集，API调用为阻塞IO）"""
+        return await asyncio.to_thread(self.analyze_video_slice, video_path, analysis_type)
+    
+    async def analyze_batch_async(
+        self,
+        video_paths: List[str],
+        analysis_type: str = "dual",
+        concurrency_limit: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        并发分析多个视频片段，重叠各切片的API网络等待时间
+        
+        Args:
+            video_paths: 视频片段文件路径列表
+            analysis_type: 分析类型 ("dual", "enhanced")
+            concurrency_limit: 最大并发数（受API QPS限制）
+            
+        Returns:
+            与video_paths顺序一致的分析结果列表
+        """
+        semaphore = asyncio.Semaphore(concurrency_limit)
+        
+        async def _analyze_one(video_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_video_slice_async(video_path, analysis_type)
+        
+        return await asyncio.gather(*[_analyze_one(path) for path in video_paths])
+    
     def _perform_dual_stage_visual_analysis(self, video_path: str) -> Dict[str, Any]:
         """🆕 执行Qwen单级分析（禁用Gemini回退）"""
         try:
@@ -1579,179 +2228,71 @@ class DualStageAnalyzer:
 
     def _infer_scene_from_text(self, text: str) -> str:
         """从文本描述中推断场景（支持中英文）"""
-        try:
-            text_lower = text.lower()
-            
-            # 中文场景关键词
-            chinese_scene_keywords = {
-                '厨房': '家中厨房',
-                '客厅': '家中客厅', 
-                '餐厅': '家中餐厅',
-                '卧室': '家中卧室',
-                '医院': '医院环境',
-                '诊所': '医疗场所',
-                '户外': '户外场景',
-                '教室': '室内教室',
-                '办公': '办公环境'
-            }
-            
-            # 英文场景关键词
-            english_scene_keywords = {
-                'kitchen': '家中厨房',
-                'living room': '家中客厅',
-                'bedroom': '家中卧室', 
-                'hospital': '医院环境',
-                'clinic': '医疗场所',
-                'outdoor': '户外场景',
-                'classroom': '室内教室',
-                'office': '办公环境'
-            }
-            
-            # 中文关键词匹配
-            for keyword, scene in chinese_scene_keywords.items():
-                if keyword in text:
-                    return scene
-            
-            # 英文关键词匹配
-            for keyword, scene in english_scene_keywords.items():
-                if keyword in text_lower:
-                    return scene
-            
-            # 根据内容推断
-            if any(word in text_lower for word in ['cooking', 'preparing', 'formula', '冲泡', '准备']):
-                return '家中厨房'
-            elif any(word in text_lower for word in ['playing', 'dancing', '玩耍', '游戏']):
-                return '家中客厅'
-            
-            # 默认室内场景
-            return '室内场景'
-            
-        except Exception as e:
-            logger.warning(f"场景推断失败: {e}")
-            return '室内场景'
+        return _infer_scene_from_text(text)
 
     def _infer_emotion_from_text(self, text: str) -> str:
         """从文本描述中推断情绪（支持中英文）"""
-        try:
-            text_lower = text.lower()
-            
-            # 中文情绪关键词
-            chinese_emotion_keywords = {
-                '哭': '不安',
-                '哭闹': '不安',
-                '开心': '开心',
-                '高兴': '开心',
-                '玩': '开心',
-                '笑': '开心',
-                '专注': '专注',
-                '认真': '专注',
-                '焦虑': '焦虑',
-                '担心': '焦虑'
-            }
-            
-            # 英文情绪关键词  
-            english_emotion_keywords = {
-                'crying': '不安',
-                'happy': '开心',
-                'smiling': '开心',
-                'playing': '开心',
-                'focused': '专注',
-                'worried': '焦虑',
-                'calm': '平静'
-            }
-            
-            # 中文关键词匹配
-            for keyword, emotion in chinese_emotion_keywords.items():
-                if keyword in text:
-                    return emotion
-            
-            # 英文关键词匹配
-            for keyword, emotion in english_emotion_keywords.items():
-                if keyword in text_lower:
-                    return emotion
-            
-            # 默认平静情绪
-            return '平静'
-            
-        except Exception as e:
-            logger.warning(f"情绪推断失败: {e}")
-            return '平静'
+        return _infer_emotion_from_text(text)
 
-    def _extract_concise_object_from_multi_frame_analysis(self, text: str) -> tuple[str, bool]:
+    def _extract_concise_object_from_multi_frame_analysis(
+        self, text: str
+    ) -> tuple[str, bool, int, Optional[str], Optional[str]]:
         """从多图片分析文本中提取详细且结构化的多场景描述
         
+        调用方需已通过_has_multi_image_marker确认文本为多图片分析格式
+        
         Returns:
-            tuple: (详细描述文本, 是否为多场景)
+            tuple: (详细描述文本, 是否为多场景, 解析到的场景数量, 解析出的场景标签, 解析出的情绪标签)
+            未解析到scene/emotion字段时对应标签为None
         """
         try:
-            # 检测是否为多图片分析格式
-            if "### 第一张图片分析" in text or "### 图片一" in text or "### 第一组" in text:
-                logger.info("🔍 检测到多图片分析格式，进行多场景标记和结构化分析")
-                
-                # 提取所有interaction内容
-                interactions = []
-                scenes = []
-                emotions = []
-                import re
-                
-                # 匹配所有字段
-                interaction_pattern = r'\*\*interaction\*\*:\s*([^*\n]+)'
-                scene_pattern = r'\*\*scene\*\*:\s*([^*\n]+)'
-                emotion_pattern = r'\*\*emotion\*\*:\s*([^*\n]+)'
-                
-                interaction_matches = re.findall(interaction_pattern, text)
-                scene_matches = re.findall(scene_pattern, text)
-                emotion_matches = re.findall(emotion_pattern, text)
-                
-                # 清理和收集数据
-                for match in interaction_matches:
-                    interaction = match.strip()
-                    if interaction and len(interaction) > 2:
-                        interactions.append(interaction)
-                
-                for match in scene_matches:
-                    scene = match.strip()
-                    if scene and len(scene) > 2:
-                        scenes.append(scene)
-                
-                for match in emotion_matches:
-                    emotion = match.strip()
-                    if emotion and len(emotion) > 1:
-                        emotions.append(emotion)
-                
-                if interactions:
-                    scene_count = len(interactions)
-                    logger.info(f"📊 发现 {scene_count} 个场景：{len(set(interactions))} 个不同动作")
-                    
-                    # 🎯 策略1: 单场景情况（不标记为多场景）
-                    if scene_count == 1:
-                        return interactions[0], False
-                    
-                    # 🎯 策略2: 多场景情况 - 生成详细结构化描述并标记
-                    is_multi_scene = True
-                    structured_description = self._create_structured_multi_scene_description(interactions, scenes, emotions)
-                    
-                    # 🆕 添加场景总结信息，便于后续分类
-                    scene_summary = self._generate_scene_summary_for_classification(interactions, scenes, emotions)
-                    
-                    # 🎯 组合详细描述和分类总结
-                    full_description = f"{structured_description} | 总结: {scene_summary}"
-                    
-                    logger.info(f"📝 多场景结构化描述: {full_description}")
-                    return full_description, is_multi_scene
-                
-                # 如果没有找到interaction，尝试提取其他有用信息
-                logger.warning("⚠️ 多图片分析中未找到interaction字段")
-                
-            # 🎯 策略3: 非多图片格式的处理（不是多场景）
+            logger.info("🔍 检测到多图片分析格式，进行多场景标记和结构化分析")
+            
+            # 单次扫描匹配所有字段，清理后按字段收集
+            buckets = {'interaction': [], 'scene': [], 'emotion': []}
+            for match in _MULTI_FIELD_RE.finditer(text):
+                field = match.group('k')
+                value = match.group('v').strip()
+                if len(value) > _MULTI_FIELD_MIN_LENGTHS[field]:
+                    buckets[field].append(value)
+            interactions = buckets['interaction']
+            scenes = buckets['scene']
+            emotions = buckets['emotion']
+            
+            if interactions:
+                scene_count = len(interactions)
+                # 已解析的scene/emotion字段映射为标准标签后多数表决
+                parsed_scene = _majority_label(scenes, _SCENE_MATCHER)
+                parsed_emotion = _majority_label(emotions, _EMOTION_MATCHER)
+                logger.info(f"📊 发现 {scene_count} 个场景：{len(set(interactions))} 个不同动作")
+                
+                # 🎯 策略1: 单场景情况（不标记为多场景）
+                if scene_count == 1:
+                    return interactions[0], False, 1, parsed_scene, parsed_emotion
+                
+                # 🎯 策略2: 多场景情况 - 生成详细结构化描述并标记
+                is_multi_scene = True
+                structured_description = self._create_structured_multi_scene_description(interactions, scenes, emotions)
+                
+                # 🆕 添加场景总结信息，便于后续分类
+                scene_summary = self._generate_scene_summary_for_classification(interactions, scenes, emotions)
+                
+                # 🎯 组合详细描述和分类总结
+                full_description = f"{structured_description} | 总结: {scene_summary}"
+                
+                logger.info(f"📝 多场景结构化描述: {full_description}")
+                return full_description, is_multi_scene, scene_count, parsed_scene, parsed_emotion
+            
+            # 如果没有找到interaction，回退到简单动作描述（不是多场景）
+            logger.warning("⚠️ 多图片分析中未找到interaction字段")
             simple_desc = self._extract_simple_action_description(text)
-            return simple_desc, False
+            return simple_desc, False, 1, None, None
             
         except Exception as e:
             logger.error(f"❌ 多场景分析失败: {e}")
             # 返回前50个字符作为备选，不标记为多场景
-            fallback = text[:50] + "..." if len(text) > 50 else text
-            return fallback, False
+            fallback = _truncate(text, 50)
+            return fallback, False, 1, None, None
 
     def _create_structured_multi_scene_description(self, interactions: list, scenes: list, emotions: list) -> str:
         """创建结构化的多场景描述，详细覆盖所有场景，便于后续分类"""
@@ -1770,26 +2311,20 @@ class DualStageAnalyzer:
             main_actions = scene_analysis.get('unique_actions', [])
             main_subject = main_subjects[0] if main_subjects else '主体'
             
-            # 📊 生成详细的场景描述
-            detailed_scenes = []
-            for i, interaction in enumerate(interactions[:5]):  # 最多显示5个场景
-                # 提取每个场景的关键信息
-                scene_info = self._extract_scene_key_info(interaction, scenes[i] if i < len(scenes) else "")
-                detailed_scenes.append(f"场景{i+1}: {scene_info}")
+            # 📊 生成详细的场景描述：最多显示5个场景，缺少scene字段的补空串
+            detailed_scenes = [
+                f"场景{i+1}: {self._extract_scene_key_info(interaction, scene)}"
+                for i, (interaction, scene) in enumerate(zip(interactions[:5], list(scenes[:5]) + [""] * 5))
+            ]
             
             # 🎯 创建结构化描述
-            if scene_count == 2:
-                return f"双场景序列 - {detailed_scenes[0]}; {detailed_scenes[1]}"
-            elif scene_count == 3:
-                return f"三场景序列 - {detailed_scenes[0]}; {detailed_scenes[1]}; {detailed_scenes[2]}"
-            elif scene_count <= 5:
-                scenes_desc = "; ".join(detailed_scenes)
-                return f"多场景序列({scene_count}个) - {scenes_desc}"
+            if scene_count <= 5:
+                prefix = {2: "双场景序列", 3: "三场景序列"}.get(scene_count, f"多场景序列({scene_count}个)")
             else:
                 # 超过5个场景，显示前3个和后2个
-                first_scenes = "; ".join(detailed_scenes[:3])
-                last_scenes = "; ".join(detailed_scenes[-2:])
-                return f"复杂多场景({scene_count}个) - {first_scenes}; ...; {last_scenes}"
+                prefix = f"复杂多场景({scene_count}个)"
+                detailed_scenes.insert(3, "...")
+            return f"{prefix} - {'; '.join(detailed_scenes)}"
                 
         except Exception as e:
             logger.error(f"❌ 结构化描述创建失败: {e}")
@@ -1799,71 +2334,23 @@ class DualStageAnalyzer:
     def _extract_scene_key_info(self, interaction: str, scene: str) -> str:
         """提取单个场景的关键信息"""
         try:
-            # 🔍 提取主要元素
-            subject = "主体"
-            action = "行为"
-            object_item = "对象"
-            
-            # 识别主体
-            if '妈妈' in interaction or '女人' in interaction or '母亲' in interaction:
-                subject = "妈妈"
-            elif '宝宝' in interaction or '婴儿' in interaction or '孩子' in interaction:
-                subject = "宝宝"
-            elif '医生' in interaction or '专家' in interaction or '护士' in interaction:
-                subject = "医生"
-            elif '工作人员' in interaction or '教练' in interaction:
-                subject = "工作人员"
-            elif '产品' in interaction or '奶粉' in interaction or '奶瓶' in interaction:
-                subject = "产品"
-            
-            # 识别动作
-            action_keywords = {
-                '喂养': ['喂', '喝奶', '饮用', '吃'],
-                '护理': ['护理', '抚摸', '轻拍', '照顾', '换尿布'],
-                '互动': ['逗', '互动', '交谈', '玩耍', '拍照'],
-                '展示': ['展示', '显示', '拿着', '手持', '呈现'],
-                '准备': ['冲泡', '准备', '调制', '搅拌'],
-                '情绪': ['哭闹', '哭泣', '笑', '开心', '不安'],
-                '教育': ['教导', '指导', '解释', '演示'],
-                '检查': ['检查', '观察', '查看', '测试']
-            }
-            
-            for action_type, keywords in action_keywords.items():
-                if any(keyword in interaction for keyword in keywords):
-                    action = action_type
-                    break
-            
-            # 识别对象
-            if '奶粉' in interaction or '配方奶' in interaction:
-                object_item = "奶粉"
-            elif '奶瓶' in interaction:
-                object_item = "奶瓶"
-            elif '产品' in interaction or '包装' in interaction:
-                object_item = "产品"
-            elif '营养' in interaction or '标签' in interaction:
-                object_item = "营养信息"
+            # 🔍 单次扫描提取主体、动作、对象
+            key_info = _SCENE_KEY_INFO_MATCHER.first_by_category(interaction)
+            subject = key_info.get('subject', "主体")
+            action = key_info.get('action', "行为")
+            object_item = key_info.get('object', "对象")
             
             # 添加场景信息
             scene_info = ""
             if scene and scene.strip():
-                scene_clean = scene.strip()
-                if '厨房' in scene_clean:
-                    scene_info = "在厨房"
-                elif '客厅' in scene_clean:
-                    scene_info = "在客厅"
-                elif '医院' in scene_clean:
-                    scene_info = "在医院"
-                elif '户外' in scene_clean:
-                    scene_info = "在户外"
-                elif '卧室' in scene_clean:
-                    scene_info = "在卧室"
+                scene_info = _SCENE_LOCATION_MATCHER.first(scene.strip(), default="")
             
             # 组合成简洁描述
             return f"{subject}{action}{object_item}{scene_info}"
             
         except Exception as e:
             logger.error(f"❌ 场景关键信息提取失败: {e}")
-            return interaction[:15] + "..." if len(interaction) > 15 else interaction
+            return _truncate(interaction, 15)
 
     def _create_simple_scene_list(self, interactions: list) -> str:
         """创建简单的场景列表（备用方案）"""
@@ -1874,7 +2361,7 @@ class DualStageAnalyzer:
             # 限制每个场景描述长度
             simplified_scenes = []
             for i, interaction in enumerate(interactions[:5]):
-                short_desc = interaction[:12] + "..." if len(interaction) > 12 else interaction
+                short_desc = _truncate(interaction, 12)
                 simplified_scenes.append(f"第{i+1}段:{short_desc}")
             
             if len(interactions) > 5:
@@ -1888,60 +2375,28 @@ class DualStageAnalyzer:
 
     def _extract_action_keywords(self, interaction: str) -> str:
         """从interaction中提取关键动作词"""
-        try:
-            # 动作关键词映射
-            action_mapping = {
-                '展示': ['展示', '显示', '拿着', '手持'],
-                '逗': ['逗', '玩', '互动'],
-                '喂养': ['喝奶', '喂', '喂养'],
-                '护理': ['抚摸', '轻拍', '护理', '照顾'],
-                '自拍': ['自拍', '拍照'],
-                '交谈': ['交谈', '交流', '对话'],
-                '游泳': ['游泳', '水中', '支撑'],
-                '准备': ['准备', '冲泡', '调制']
-            }
-            
-            for action, keywords in action_mapping.items():
-                if any(keyword in interaction for keyword in keywords):
-                    return action
-            
-            # 如果没找到映射，提取主要动词
-            import re
-            # 提取中文动词模式
-            verb_pattern = r'([\u4e00-\u9fa5]{1,2}(?:着|了|过|在|给)*[\u4e00-\u9fa5]{0,2})'
-            matches = re.findall(verb_pattern, interaction)
-            if matches:
-                return matches[0][:4]  # 取前4个字符
-            
-            # 最后回退
-            return interaction[:6] + "..." if len(interaction) > 6 else interaction
-            
-        except Exception as e:
-            logger.error(f"❌ 动作关键词提取失败: {e}")
-            return interaction[:8]
+        return _extract_action_keywords(interaction)
 
     def _actions_are_similar(self, action1: str, action2: str) -> bool:
         """判断两个动作是否相似"""
         try:
             # 提取关键词进行比较
-            key1 = self._extract_action_keywords(action1)
-            key2 = self._extract_action_keywords(action2)
+            key1 = _extract_action_keywords(action1)
+            key2 = _extract_action_keywords(action2)
             
             # 如果关键词相同，认为相似
             if key1 == key2:
                 return True
             
-            # 检查是否包含相同的主体和动词
-            similar_pairs = [
-                ['喝奶', '喂养'], ['展示', '显示'], ['逗', '互动'], 
-                ['抚摸', '轻拍'], ['交谈', '交流'], ['自拍', '拍照']
-            ]
-            
-            for pair in similar_pairs:
-                if (pair[0] in action1 and pair[1] in action2) or (pair[1] in action1 and pair[0] in action2):
-                    return True
-            
-            return False
+            # 检查是否包含相同的主体和动词：各自命中的词两两组合查表
+            words1 = {word for _, word in _SIMILAR_ACTION_WORD_MATCHER.iter(action1)}
+            if not words1:
+                return False
+            words2 = {word for _, word in _SIMILAR_ACTION_WORD_MATCHER.iter(action2)}
+            return any(
+                frozenset((word1, word2)) in _SIMILAR_ACTION_PAIRS
+                for word1 in words1 for word2 in words2
+            )
         
         except Exception as e:
             logger.error(f"❌ 动作相似性判断失败: {e}")
@@ -1950,59 +2405,25 @@ class DualStageAnalyzer:
     def _analyze_scene_patterns(self, interactions: list, scenes: list) -> dict:
         """分析场景模式"""
         try:
-            # 🔍 主体分析
+            # 🔍 主体与动作类型分析：每个interaction单次扫描
             subjects = []
-            for interaction in interactions:
-                if '妈妈' in interaction or '女人' in interaction or '女性' in interaction:
-                    subjects.append('妈妈')
-                elif '宝宝' in interaction or '婴儿' in interaction:
-                    subjects.append('宝宝')
-                elif '工作人员' in interaction or '教练' in interaction:
-                    subjects.append('工作人员')
-                elif '奶粉' in interaction or '产品' in interaction or '包装' in interaction:
-                    subjects.append('产品')
-                else:
-                    subjects.append('其他')
-            
-            # 🔍 动作类型分析
             action_types = []
-            action_mapping = {
-                '护理': ['护理', '抚摸', '轻拍', '换尿布', '照顾'],
-                '互动': ['逗', '互动', '交谈', '拍照', '自拍', '玩'],
-                '喂养': ['喝奶', '喂养', '准备奶', '冲泡', '喝'],
-                '展示': ['展示', '显示', '拿着', '手持'],
-                '运动': ['游泳', '水中', '运动', '锻炼']
-            }
-            
             for interaction in interactions:
-                categorized = False
-                for action_type, keywords in action_mapping.items():
-                    if any(keyword in interaction for keyword in keywords):
-                        action_types.append(action_type)
-                        categorized = True
-                        break
-                if not categorized:
-                    action_types.append('其他')
+                pattern_info = _SCENE_PATTERN_MATCHER.first_by_category(interaction)
+                subjects.append(pattern_info.get('subject', '其他'))
+                action_types.append(pattern_info.get('action', '其他'))
             
             # 🔍 场景环境分析
             environments = []
             if scenes:
                 for scene in scenes:
-                    if '游泳' in scene or '水中' in scene:
-                        environments.append('游泳馆')
-                    elif '厨房' in scene:
-                        environments.append('厨房')
-                    elif '婴儿房' in scene or '卧室' in scene:
-                        environments.append('婴儿房')
-                    elif '客厅' in scene:
-                        environments.append('客厅')
-                    else:
-                        environments.append('室内')
+                    environments.append(_SCENE_ENVIRONMENT_MATCHER.first(scene, default='室内'))
             
             # 🎯 模式判断
-            unique_subjects = list(set(subjects))
-            unique_actions = list(set(action_types))
-            unique_environments = list(set(environments))
+            # dict.fromkeys单次去重并保留首次出现顺序，多场景描述的输出顺序稳定
+            unique_subjects = list(dict.fromkeys(subjects))
+            unique_actions = list(dict.fromkeys(action_types))
+            unique_environments = list(dict.fromkeys(environments))
             
             is_progressive = len(unique_actions) > 1 and len(unique_subjects) >= 1
             is_parallel = len(unique_subjects) > 1 and len(set(action_types[:2])) == 1  # 前两个动作相同
@@ -2034,38 +2455,34 @@ class DualStageAnalyzer:
         """提取简单动作描述（非多图片格式）"""
         try:
             # 如果包含明显的行为描述，直接提取
-            simple_patterns = [
-                r'(妈妈|女人|女性|宝宝|工作人员)[^。，]+?(?:展示|逗|抚摸|轻拍|换|喂|喝|准备|交谈|自拍|拍照)[^。，]*',
-                r'(展示|显示)[^。，]*?(产品|奶瓶|奶粉|营养标签)[^。，]*',
-                r'(手持|拿着)[^。，]*?(展示|显示)[^。，]*'
-            ]
-            
-            for pattern in simple_patterns:
-                match = re.search(pattern, text)
+            for pattern in _SIMPLE_ACTION_RES:
+                match = pattern.search(text)
                 if match:
                     result = match.group(0).strip()
                     if len(result) <= 25:  # 稍微放宽长度限制
                         return result
             
             # 如果都没找到，返回前25个字符
-            cleaned_text = re.sub(r'[#*]+', '', text).strip()
-            if len(cleaned_text) > 25:
-                return cleaned_text[:25] + "..."
-            
-            return cleaned_text
+            cleaned_text = _MARKDOWN_MARK_RE.sub('', text).strip()
+            return _truncate(cleaned_text, 25)
             
         except Exception as e:
             logger.error(f"❌ 简单动作描述提取失败: {e}")
-            return text[:20] + "..." if len(text) > 20 else text
+            return _truncate(text, 20)
 
     def _extract_meaningful_content_from_text(self, text: str) -> Dict[str, Any]:
         """从文本中提取有意义的内容，确保具体性"""
         try:
             # 🔧 基础清理和预处理
-            text = re.sub(r'[{}[\]"]', '', text).strip()
+            text = text.translate(_JSON_PUNCT_STRIP_TABLE).strip()
             
-            # 🆕 专门处理多图片分析格式，提取简洁的object描述
-            concise_object, is_multi_scene = self._extract_concise_object_from_multi_frame_analysis(text)
+            # 🆕 专门处理多图片分析格式，提取简洁的object描述；单帧文本直接走简单动作提取
+            if _has_multi_image_marker(text):
+                (concise_object, is_multi_scene, scene_count,
+                 parsed_scene, parsed_emotion) = self._extract_concise_object_from_multi_frame_analysis(text)
+            else:
+                concise_object = self._extract_simple_action_description(text)
+                is_multi_scene, scene_count, parsed_scene, parsed_emotion = False, 1, None, None
             
             # 🎯 如果成功提取到描述，使用它作为主要结果
             if concise_object and len(concise_object) <= 100:  # 🆕 适度放宽长度限制以容纳详细多场景描述
@@ -2075,13 +2492,14 @@ class DualStageAnalyzer:
                 # 📊 构建结果
                 result = {
                     "object": self._clean_field_format(concise_object),
-                    "scene": self._infer_scene_from_text(text),  # 从完整文本推断场景
-                    "emotion": self._infer_emotion_from_text(text),  # 从完整文本推断情感
+                    # 优先使用已解析的字段，没有时再从完整文本推断
+                    "scene": parsed_scene or self._infer_scene_from_text(text),
+                    "emotion": parsed_emotion or self._infer_emotion_from_text(text),
                     "brand_elements": "无",
                     "confidence": 0.92 if is_multi_scene else 0.88,  # 🆕 多场景分析有更高置信度
                     "success": True,
                     "is_multi_scene": is_multi_scene,  # 🆕 添加多场景标记
-                    "scene_count": text.count("### ") if is_multi_scene else 1  # 🆕 场景数量
+                    "scene_count": scene_count  # 🆕 场景数量（与实际解析到的场景一致）
                 }
                 
                 logger.info(f"🎯 {extraction_type}提取结果: object='{result['object']}', scene='{result['scene']}', emotion='{result['emotion']}', multi_scene={is_multi_scene}")
@@ -2138,60 +2556,11 @@ class DualStageAnalyzer:
             text_lower = text.lower()
             score = 0.3  # 🚀 基础分数从0改为0.3，更宽松
             
-            # 🎯 具体物体词汇 (+0.2，降低权重)
-            specific_objects = [
-                'baby', 'child', 'girl', 'boy', 'mother', 'father', 'toddler',
-                '宝宝', '孩子', '女孩', '男孩', '妈妈', '爸爸', '幼儿', '女人', '人',
-                'bottle', 'milk', 'formula', 'toy', 'book', 'food', 'package', 'product',
-                '奶瓶', '牛奶', '奶粉', '玩具', '书', '食物', '餐具', '包装', '产品', '罐'
-            ]
-            for obj in specific_objects:
-                if obj in text_lower:
-                    score += 0.2
-                    break
-            
-            # 🎯 具体动作词汇 (+0.3，保持权重)
-            specific_actions = [
-                'drinking', 'eating', 'playing', 'crying', 'smiling', 'walking', 'sitting',
-                'holding', 'showing', 'displaying', 'preparing',
-                '喝', '吃', '玩', '哭', '笑', '走', '坐', '拿', '放', '看', '听', '展示', 
-                '显示', '摆放', '突出', '冲泡', '准备', '递给', '抱着'
-            ]
-            for action in specific_actions:
-                if action in text_lower:
-                    score += 0.3
-                    break
-            
-            # 🎯 具体场景词汇 (+0.1，降低权重)
-            specific_places = [
-                'table', 'chair', 'bed', 'sofa', 'kitchen', 'living room', 'hospital',
-                '桌子', '椅子', '床', '沙发', '厨房', '客厅', '医院', '餐桌', '室内', '桌面'
-            ]
-            for place in specific_places:
-                if place in text_lower:
-                    score += 0.1
-                    break
-            
-            # 🔧 修复：大幅减少通用词汇惩罚 (-0.2，从-0.5减少)
-            very_generic_terms = [
-                'video content analysis', 'general content', 'unknown content',
-                '视频内容分析', '通用内容', '未知内容'  # 只惩罚真正通用的词汇
-            ]
-            for generic in very_generic_terms:
-                if generic in text_lower:
-                    score -= 0.2  # 🚀 减少惩罚力度
-                    break
-            
-            # 🔧 移除过短描述惩罚，因为简洁也可能很有效
-            
-            # 🎯 新增：包含品牌或产品信息的加分
-            product_terms = [
-                '营养标签', '品牌标识', '奶粉罐', '包装', '标签', '成分', 'logo', 'brand'
-            ]
-            for term in product_terms:
-                if term in text_lower:
-                    score += 0.2
-                    break
+            # 单次扫描收集命中的类别，每个类别只加减一次分
+            hit_categories = {category for _, category in _SPECIFICITY_MATCHER.iter(text_lower)}
+            for category, delta in _SPECIFICITY_WEIGHTS:
+                if category in hit_categories:
+                    score += delta
             
             return max(0.1, min(1.0, score))  # 🚀 最低分从0改为0.1，避免完全为0
             
@@ -2202,74 +2571,70 @@ class DualStageAnalyzer:
     def _extract_key_sentences_from_text(self, text: str, scenario: str = "母婴产品") -> list:
         """从文本中提取关键句子 - 使用配置化的关键词管理"""
         try:
-            import re
-            import sys
-            from pathlib import Path
-            sys.path.append(str(Path(__file__).parent.parent))
-            from config.keyword_extraction_config import get_keyword_config
-            
-            # 获取关键词配置
-            keyword_config = get_keyword_config()
-            extraction_settings = keyword_config.get_extraction_settings()
-            keywords = keyword_config.get_keywords_for_extraction(scenario)
-            regex_patterns = keyword_config.get_regex_patterns()
-            
-            # 分割句子
-            sentences = re.split(r'[.!?。！？]+', text)
-            key_sentences = []
+            # 获取关键词配置（按场景缓存）
+            extraction_settings, keywords, regex_patterns = _get_keyword_bundle(scenario)
+            case_sensitive = extraction_settings.get("case_sensitive", False)
+            min_length = extraction_settings.get("min_sentence_length", 8)
+            
+            # 分割句子；分隔符不受大小写转换影响，原文与扫描文本的句子一一对应
+            sentences = _SENTENCE_SPLIT_RE.split(text)
+            scan_text = text if case_sensitive else text.lower()
+            sentence_spans = []
+            pos = 0
+            for m in _SENTENCE_SPLIT_RE.finditer(scan_text):
+                sentence_spans.append((pos, m.start()))
+                pos = m.end()
+            sentence_spans.append((pos, len(scan_text)))
+            sentence_starts = [start for start, _ in sentence_spans]
             
             logger.info(f"🔍 使用 {len(keywords)} 个关键词和 {len(regex_patterns)} 个正则模式进行提取")
             
-            for sentence in sentences:
+            # 🎯 单次扫描全文：关键词与主谓结构命中按所在句子分桶
+            keyword_matcher = _get_sentence_keyword_matcher(keywords, case_sensitive)
+            keyword_hits = [set() for _ in sentence_spans]
+            svo_hits = [set() for _ in sentence_spans]
+            for end, (keyword, length) in keyword_matcher.iter(scan_text):
+                idx = bisect.bisect_right(sentence_starts, end) - 1
+                start, stop = sentence_spans[idx]
+                # 跨越句子分隔符的命中不计入（与逐句匹配一致）
+                if end < stop and end - length + 1 >= start:
+                    keyword_hits[idx].add(keyword)
+            for end, role in _SVO_MATCHER.iter(scan_text):
+                svo_hits[bisect.bisect_right(sentence_starts, end) - 1].add(role)
+            
+            key_sentences = []
+            for idx, sentence in enumerate(sentences):
                 sentence = sentence.strip()
                 
                 # 基础过滤
-                min_length = extraction_settings.get("min_sentence_length", 8)
                 if len(sentence) < min_length:
                     continue
                 
-                sentence_score = 0
-                match_details = []
-                
                 # 🎯 方法1: 关键词匹配（基础方法）
-                sentence_lower = sentence.lower() if not extraction_settings.get("case_sensitive", False) else sentence
-                for keyword in keywords:
-                    keyword_check = keyword.lower() if not extraction_settings.get("case_sensitive", False) else keyword
-                    if keyword_check in sentence_lower:
-                        sentence_score += 1
-                        match_details.append(f"关键词:{keyword}")
+                sentence_score = len(keyword_hits[idx])
                 
                 # 🎯 方法2: 正则表达式模式匹配（高级方法）
                 for pattern_config in regex_patterns:
-                    pattern = pattern_config["pattern"]
-                    weight = pattern_config["weight"]
-                    
-                    if pattern.search(sentence):
-                        sentence_score += weight
-                        match_details.append(f"模式:{pattern_config['name']}")
+                    if pattern_config["pattern"].search(sentence):
+                        sentence_score += pattern_config["weight"]
                 
                 # 🎯 方法3: 语义结构分析（智能方法）
-                if self._has_subject_verb_object_structure(sentence):
+                if svo_hits[idx] == _SVO_ROLES:
                     sentence_score += 1.5
-                    match_details.append("主谓宾结构")
                 
                 # 决定是否保留句子
                 if sentence_score >= 1.0:  # 至少匹配一个条件
-                    key_sentences.append({
-                        "sentence": sentence,
-                        "score": sentence_score,
-                        "matches": match_details
-                    })
+                    key_sentences.append((sentence_score, sentence))
                     logger.debug(f"✅ 保留句子 (得分:{sentence_score:.1f}): {sentence[:50]}...")
             
-            # 按得分排序并返回最佳句子
-            key_sentences.sort(key=lambda x: x["score"], reverse=True)
+            # 取得分最高的若干句子（同分保持原文顺序）
             max_sentences = extraction_settings.get("max_sentences", 3)
+            top_sentences = heapq.nlargest(max_sentences, key_sentences, key=itemgetter(0))
             
-            best_sentences = [item["sentence"] for item in key_sentences[:max_sentences]]
+            best_sentences = [sentence for _, sentence in top_sentences]
             
             if best_sentences:
-                logger.info(f"🎯 提取到 {len(best_sentences)} 个关键句子，最高得分: {key_sentences[0]['score']:.1f}")
+                logger.info(f"🎯 提取到 {len(best_sentences)} 个关键句子，最高得分: {top_sentences[0][0]:.1f}")
             else:
                 logger.warning("⚠️ 未提取到任何关键句子，可能需要调整配置")
             
@@ -2283,16 +2648,13 @@ class DualStageAnalyzer:
     def _has_subject_verb_object_structure(self, sentence: str) -> bool:
         """检测句子是否具有主谓宾结构"""
         try:
-            # 简单的中文主谓宾结构检测
-            chinese_verbs = ["展示", "拿着", "喝", "吃", "玩", "坐", "看", "抱", "喂", "哭", "笑", "制作", "准备"]
-            chinese_subjects = ["宝宝", "妈妈", "爸爸", "孩子", "婴儿", "产品", "奶粉罐", "包装"]
-            chinese_objects = ["奶瓶", "奶粉", "玩具", "食品", "标签", "营养成分"]
-            
-            has_subject = any(subj in sentence for subj in chinese_subjects)
-            has_verb = any(verb in sentence for verb in chinese_verbs)
-            has_object = any(obj in sentence for obj in chinese_objects)
-            
-            return has_subject and has_verb
+            # 单次扫描，主体和动词都命中后立即返回
+            roles = set()
+            for _, role in _SVO_MATCHER.iter(sentence):
+                roles.add(role)
+                if len(roles) == 2:
+                    return True
+            return False
             
         except Exception:
             return False
@@ -2300,40 +2662,28 @@ class DualStageAnalyzer:
     def _extract_key_sentences_fallback(self, text: str) -> list:
         """回退的简单关键句子提取方法 - 也使用配置化关键词"""
         try:
-            import re
-            sentences = re.split(r'[.!?。！？]+', text)
+            sentences = _SENTENCE_SPLIT_RE.split(text)
             
             # 🔧 移除硬编码：使用配置化的基础关键词
             try:
-                import sys
-                from pathlib import Path
-                sys.path.append(str(Path(__file__).parent.parent))
-                from config.keyword_extraction_config import get_keyword_config
-                
                 # 使用高权重类别的关键词作为基础回退
-                keyword_config = get_keyword_config()
-                all_keywords = []
-                for category, config in keyword_config.keywords_config["keyword_categories"].items():
-                    if config.get("weight", 1.0) >= 1.0:  # 只使用权重>=1.0的类别
-                        for keywords in config["keywords"].values():
-                            all_keywords.extend(keywords[:5])  # 每类最多5个词
-                
-                basic_keywords = list(set(all_keywords))  # 去重
-                logger.info(f"🔄 回退方法使用 {len(basic_keywords)} 个配置化关键词")
+                basic_matcher = _get_fallback_keyword_matcher(get_keyword_config())
+                logger.info(f"🔄 回退方法使用 {len(basic_matcher)} 个配置化关键词")
                 
             except Exception as config_error:
                 logger.warning(f"⚠️ 配置加载失败，使用最小硬编码集: {config_error}")
                 # 🚨 最后的硬编码保障：只保留最核心的词汇
-                basic_keywords = ["宝宝", "妈妈", "baby", "mother"]
+                basic_matcher = _FALLBACK_BASIC_MATCHER
             
             key_sentences = []
             for sentence in sentences:
                 sentence = sentence.strip()
-                if (len(sentence) >= 8 and 
-                    any(word in sentence.lower() for word in basic_keywords)):
+                if len(sentence) >= 8 and basic_matcher.has_match(sentence.lower()):
                     key_sentences.append(sentence)
+                    if len(key_sentences) == 3:
+                        break
             
-            return key_sentences[:3]
+            return key_sentences
             
         except Exception as e:
             logger.warning(f"回退提取方法失败: {e}")
@@ -2345,29 +2695,7 @@ class DualStageAnalyzer:
             return text
         
         try:
-            # 移除各种方括号和引号
-            cleaned = text
-            
-            # 移除方括号 [ ]
-            cleaned = cleaned.replace('[', '').replace(']', '')
-            
-            # 移除多余的引号
-            cleaned = cleaned.replace('"', '').replace("'", '')
-            
-            # 移除多余的逗号分隔（但保留内容中的逗号）
-            if cleaned.startswith(','):
-                cleaned = cleaned[1:]
-            if cleaned.endswith(','):
-                cleaned = cleaned[:-1]
-            
-            # 清理多余的空格
-            cleaned = ' '.join(cleaned.split())
-            
-            # 🔧 统一处理空值
-            if cleaned.lower().strip() in ['无', 'none', 'null', '', '没有', '未知']:
-                return '无'
-            
-            return cleaned.strip()
+            return _clean_field_value(text)
             
         except Exception as e:
             logger.warning(f"字段格式清理失败: {e}")
@@ -2378,35 +2706,23 @@ class DualStageAnalyzer:
         try:
             if not interaction_text:
                 return True, "empty content"
-                
-            text_lower = interaction_text.lower()
             
             # 🎯 新策略：任何切片都有分析价值，不再因为无人物而标记为无效
             # 无人物的切片也可能包含产品信息、品牌元素、环境信息等有价值内容
             
-            # 1. 检测分析彻底失败的情况 - 🔧 更严格的检测，避免误判
-            true_failure_phrases = [
-                "analysis completely failed", "处理彻底失败", "无法解析视频", "视频损坏",
-                "fatal error", "严重错误", "complete failure", "total failure"
-            ]
-            # 🚀 移除"analysis failed"的检测，因为这可能是正常的分析结果描述
-            for phrase in true_failure_phrases:
-                if phrase in text_lower:
-                    return True, "analysis failed completely"
-            
-            # 2. 检测完全空白或无意义的内容
-            very_short = len(interaction_text.strip()) < 3
-            completely_empty = interaction_text.strip() in ["", "无", "none", "null", "N/A", "未知", "unknown"]
-            
-            if very_short or completely_empty:
+            # 1. 检测完全空白或无意义的内容（开销最小，先判断；
+            #    此类文本不可能包含下面的失败短语，先后顺序不影响结果）
+            stripped = interaction_text.strip()
+            if len(stripped) < 3 or stripped in _MEANINGLESS_CONTENT:
                 return True, "empty or meaningless content"
             
+            # 2. 检测分析彻底失败的情况 - 🔧 更严格的检测，避免误判
+            # 🚀 移除"analysis failed"的检测，因为这可能是正常的分析结果描述
+            if _TRUE_FAILURE_RE.search(interaction_text):
+                return True, "analysis failed completely"
+            
             # 3. 检测视频文件损坏或无法解析的情况
-            corrupted_indicators = [
-                "corrupted", "损坏", "无法播放", "文件错误", "format error",
-                "cannot decode", "解码失败", "视频损坏"
-            ]
-            if any(phrase in text_lower for phrase in corrupted_indicators):
+            if _CORRUPTED_RE.search(interaction_text):
                 return True, "corrupted or unreadable video file"
             
             # 🔧 重要改变：移除所有基于人物存在的无效判断
@@ -2429,71 +2745,36 @@ class DualStageAnalyzer:
             # 🔍 分析主要元素
             summary_parts = []
             
-            # 1. 主体分析
-            subjects = set()
-            for interaction in interactions:
-                if '妈妈' in interaction or '女人' in interaction or '母亲' in interaction:
-                    subjects.add('妈妈')
-                if '宝宝' in interaction or '婴儿' in interaction or '孩子' in interaction:
-                    subjects.add('宝宝')
-                if '医生' in interaction or '专家' in interaction or '护士' in interaction:
-                    subjects.add('医生')
-                if '产品' in interaction or '奶粉' in interaction or '奶瓶' in interaction:
-                    subjects.add('产品')
+            # 🔍 单次扫描所有interaction，同时收集主体、行为类型和产品相关性
+            # （关键词不含换行符，拼接后扫描与逐条判断结果一致）
+            hits = {'subject': set(), 'behavior': set(), 'product': set()}
+            for _, (category, label) in _SCENE_SUMMARY_MATCHER.iter('\n'.join(interactions)):
+                hits[category].add(label)
             
+            # 1. 主体分析
+            subjects = hits['subject']
             if subjects:
-                summary_parts.append(f"主体: {', '.join(sorted(subjects))}")
+                summary_parts.append(f"主体: {_format_label_set(frozenset(subjects))}")
             
             # 2. 行为类型分析
-            behavior_types = set()
-            behavior_mapping = {
-                '喂养行为': ['喂', '喝奶', '饮用', '吃', '哺乳'],
-                '护理行为': ['护理', '抚摸', '轻拍', '照顾', '换尿布', '清洁'],
-                '互动行为': ['逗', '互动', '交谈', '玩耍', '拍照', '自拍'],
-                '展示行为': ['展示', '显示', '拿着', '手持', '呈现', '推荐'],
-                '准备行为': ['冲泡', '准备', '调制', '搅拌'],
-                '情绪表达': ['哭闹', '哭泣', '笑', '开心', '不安', '拒绝'],
-                '教育行为': ['教导', '指导', '解释', '演示', '说明'],
-                '检查行为': ['检查', '观察', '查看', '测试', '确认']
-            }
-            
-            for behavior_type, keywords in behavior_mapping.items():
-                if any(keyword in interaction for interaction in interactions for keyword in keywords):
-                    behavior_types.add(behavior_type)
-            
+            behavior_types = hits['behavior']
             if behavior_types:
-                summary_parts.append(f"行为: {', '.join(sorted(behavior_types))}")
-            
-            # 3. 产品相关性分析
-            product_relevance = []
-            if any('奶粉' in interaction for interaction in interactions):
-                product_relevance.append('奶粉相关')
-            if any('奶瓶' in interaction for interaction in interactions):
-                product_relevance.append('奶瓶相关')
-            if any('营养' in interaction or '标签' in interaction for interaction in interactions):
-                product_relevance.append('营养信息')
-            if any('品牌' in interaction or '产品' in interaction for interaction in interactions):
-                product_relevance.append('产品展示')
+                summary_parts.append(f"行为: {_format_label_set(frozenset(behavior_types))}")
             
+            # 3. 产品相关性分析（按声明顺序输出）
+            product_relevance = [label for label in _PRODUCT_RELEVANCE_KEYWORDS if label in hits['product']]
             if product_relevance:
                 summary_parts.append(f"产品: {', '.join(product_relevance)}")
             
             # 4. 场景环境分析
             scene_types = set()
             for scene in scenes:
-                if '厨房' in scene:
-                    scene_types.add('厨房环境')
-                elif '客厅' in scene:
-                    scene_types.add('客厅环境')
-                elif '医院' in scene or '诊所' in scene:
-                    scene_types.add('医疗环境')
-                elif '户外' in scene:
-                    scene_types.add('户外环境')
-                elif '卧室' in scene:
-                    scene_types.add('卧室环境')
+                scene_type = _SUMMARY_SCENE_TYPE_MATCHER.first(scene)
+                if scene_type is not None:
+                    scene_types.add(scene_type)
             
             if scene_types:
-                summary_parts.append(f"场景: {', '.join(sorted(scene_types))}")
+                summary_parts.append(f"场景: {_format_label_set(frozenset(scene_types))}")
             
             # 5. 情绪倾向分析
             emotion_analysis = self._analyze_emotion_trend(emotions)
@@ -2518,13 +2799,13 @@ class DualStageAnalyzer:
             if not emotions:
                 return ""
             
-            positive_emotions = ['开心', '温馨', '愉悦', '满意', '开心', '快乐']
-            negative_emotions = ['哭闹', '不安', '焦虑', '痛苦', '担心', '拒绝']
-            neutral_emotions = ['平静', '专注', '中性', '观察', '思考']
-            
-            pos_count = sum(1 for emotion in emotions if any(pos in emotion for pos in positive_emotions))
-            neg_count = sum(1 for emotion in emotions if any(neg in emotion for neg in negative_emotions))
-            neu_count = sum(1 for emotion in emotions if any(neu in emotion for neu in neutral_emotions))
+            # 单次遍历：每条情绪描述扫描一次，命中的每种倾向各计一次
+            polarity_counts = Counter()
+            for emotion in emotions:
+                polarity_counts.update({polarity for _, polarity in _EMOTION_POLARITY_MATCHER.iter(emotion)})
+            pos_count = polarity_counts['pos']
+            neg_count = polarity_counts['neg']
+            neu_count = polarity_counts['neu']
             
             if pos_count > neg_count and pos_count > neu_count:
                 return "积极倾向"
@@ -2572,21 +2853,67 @@ class BatchSliceAnalyzer:
     批量切片分析器
     """
     
+    # 并发分析线程数；API限流改为相邻请求发起时间的最小间隔（秒），不再每次调用后固定sleep
+    BATCH_MAX_WORKERS = 4
+    BATCH_REQUEST_INTERVAL = 0.5
+    
     def __init__(self):
         """初始化批量分析器"""
         self.dual_analyzer = DualStageAnalyzer()
         self.quality_control = get_quality_control()
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+    
+    def prewarm(self):
+        """
+        预热批量分析在首个文件上才会触发的冷启动开销
+        
+        加载关键词配置并构建关键句子/回退匹配器，解析DeepSeek密钥，并预先建立DeepSeek连接；
+        各步骤失败只记录日志，不影响后续分析
+        """
+        try:
+            extraction_settings, keywords, _ = _get_keyword_bundle("母婴产品")
+            _get_sentence_keyword_matcher(keywords, extraction_settings.get("case_sensitive", False))
+            _get_fallback_keyword_matcher(get_keyword_config())
+            _get_deepseek_api_key()
+            
+            deepseek_analyzer = getattr(self.dual_analyzer, "deepseek_analyzer", None)
+            if deepseek_analyzer is not None:
+                deepseek_analyzer._session.head("https://api.deepseek.com", timeout=1)
+        except Exception as e:
+            logger.debug(f"批量分析预热未完成: {e}")
+    
+    def _wait_for_rate_limit(self):
+        """API限流：保证相邻两次请求的发起时间至少相隔BATCH_REQUEST_INTERVAL秒"""
+        with self._rate_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_time)
+            self._next_request_time = start_at + self.BATCH_REQUEST_INTERVAL
+        if start_at > now:
+            time.sleep(start_at - now)
+    
+    def _analyze_one(self, video_file: str) -> Dict[str, Any]:
+        """限流后分析单个文件（在工作线程中执行）"""
+        self._wait_for_rate_limit()
+        return self.dual_analyzer.analyze_video_slice(video_file)
         
     def analyze_batch(
         self, 
         video_files: List[str], 
-        progress_callback: Optional[callable] = None  # type: ignore
+        progress_callback: Optional[callable] = None,  # type: ignore
+        max_workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         批量分析视频文件
+        
+        各文件在线程池中并发分析以重叠API网络等待；results与video_files顺序一致，
+        progress_callback按完成顺序在调用线程中触发
         """
         logger.info(f"🎯 开始批量双层识别分析，共 {len(video_files)} 个文件")
         
+        # 后台预热，与首个文件的帧提取/上传重叠进行
+        threading.Thread(target=self.prewarm, daemon=True).start()
+        
         batch_result = {
             "total_files": len(video_files),
             "success_count": 0,
@@ -2596,35 +2923,50 @@ class BatchSliceAnalyzer:
             "start_time": time.time()
         }
         
-        for i, video_file in enumerate(video_files):
-            try:
-                if progress_callback:
-                    progress_callback(f"分析 {i+1}/{len(video_files)}: {Path(video_file).name}")
-                
-                # 分析单个文件
-                result = self.dual_analyzer.analyze_video_slice(video_file)
-                
-                if result["success"]:
-                    batch_result["success_count"] += 1
-                else:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(video_files)
+        
+        with ThreadPoolExecutor(max_workers=max_workers or self.BATCH_MAX_WORKERS) as executor:
+            future_to_index = {
+                executor.submit(self._analyze_one, video_file): i
+                for i, video_file in enumerate(video_files)
+            }
+            
+            # 结果在调用线程中按完成顺序汇总，计数无需加锁
+            for done, future in enumerate(as_completed(future_to_index), 1):
+                i = future_to_index[future]
+                video_file = video_files[i]
+                try:
+                    result = future.result()
+                    
+                    if result["success"]:
+                        batch_result["success_count"] += 1
+                    else:
+                        batch_result["failed_count"] += 1
+                    
+                except Exception as e:
+                    logger.error(f"批量分析文件 {video_file} 失败: {e}")
                     batch_result["failed_count"] += 1
+                    result = {
+                        "file_path": video_file,
+                        "success": False,
+                        "error": str(e)
+                    }
                 
-                batch_result["results"].append(result)
-                
-                # API限流
-                time.sleep(0.5)
+                results[i] = result
                 
-            except Exception as e:
-                logger.error(f"批量分析文件 {video_file} 失败: {e}")
-                batch_result["failed_count"] += 1
-                batch_result["results"].append({
-                    "file_path": video_file,
-                    "success": False,
-                    "error": str(e)
-                })
+                if progress_callback:
+                    progress_callback(f"分析 {done}/{len(video_files)}: {Path(video_file).name}")
+        
+        batch_result["results"] = results
+        
+        # 统计按输入顺序累计，使频次字典的键顺序与平均值的求和顺序与并发完成顺序无关
+        stats = self._new_batch_stats()
+        for result in results:
+            if result and result.get("success"):
+                self._fold_result(stats, result)
         
         # 生成统计信息
-        batch_result["statistics"] = self._generate_batch_statistics(batch_result["results"])
+        batch_result["statistics"] = self._generate_batch_statistics(stats)
         batch_result["end_time"] = time.time()
         batch_result["duration"] = batch_result["end_time"] - batch_result["start_time"]
         
@@ -2632,145 +2974,87 @@ class BatchSliceAnalyzer:
         
         return batch_result
     
-    def _generate_batch_statistics(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """生成批量分析统计信息"""
+    @staticmethod
+    def _new_batch_stats() -> Dict[str, Any]:
+        """创建批量统计累加器"""
+        return {
+            "tag_frequency": Counter(),
+            "brand_frequency": Counter(),
+            "interaction_frequency": Counter(),
+            "scene_frequency": Counter(),
+            "emotion_frequency": Counter(),
+            "total_confidence": 0,
+            "stage2_triggered": 0,
+            "success_count": 0
+        }
+    
+    @staticmethod
+    def _fold_result(stats: Dict[str, Any], result: Dict[str, Any]):
+        """将单个成功结果累计到统计累加器"""
+        final_tags = result.get("final_tags", {})
+        
+        # 统计标签频次
+        stats["tag_frequency"].update(final_tags.get("all_tags", []))
+        
+        # 统计各类别频次
+        for key in ("interaction", "scene", "emotion"):
+            value = final_tags.get(key, "")
+            if value:
+                stats[f"{key}_frequency"][value] += 1
+        
+        brand_elements = final_tags.get("brand_elements", "")
+        if brand_elements:
+            stats["brand_frequency"].update(
+                brand for brand in map(str.strip, brand_elements.split(',')) if brand
+            )
+        
+        # 累计置信度
+        stats["total_confidence"] += final_tags.get("confidence", 0.0)
+        
+        # 统计第二阶段触发率
+        if result.get("stage2_result", {}).get("triggered", False):
+            stats["stage2_triggered"] += 1
+        
+        stats["success_count"] += 1
+    
+    def _generate_batch_statistics(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """由统计累加器生成批量分析统计信息（仅做最终的均值计算）"""
         statistics = {
-            "tag_frequency": {},
-            "brand_frequency": {},
-            "interaction_frequency": {},
-            "scene_frequency": {},
-            "emotion_frequency": {},
+            "tag_frequency": dict(stats["tag_frequency"]),
+            "brand_frequency": dict(stats["brand_frequency"]),
+            "interaction_frequency": dict(stats["interaction_frequency"]),
+            "scene_frequency": dict(stats["scene_frequency"]),
+            "emotion_frequency": dict(stats["emotion_frequency"]),
             "average_confidence": 0.0,
             "stage2_trigger_rate": 0.0
         }
         
-        successful_results = [r for r in results if r.get("success", False)]
-        if not successful_results:
+        success_count = stats["success_count"]
+        if not success_count:
             return statistics
         
-        total_confidence = 0
-        stage2_triggered = 0
-        
-        for result in successful_results:
-            final_tags = result.get("final_tags", {})
-            
-            # 统计标签频次
-            all_tags = final_tags.get("all_tags", [])
-            for tag in all_tags:
-                statistics["tag_frequency"][tag] = statistics["tag_frequency"].get(tag, 0) + 1
-            
-            # 统计各类别频次
-            interaction = final_tags.get("interaction", "")
-            if interaction:
-                statistics["interaction_frequency"][interaction] = statistics["interaction_frequency"].get(interaction, 0) + 1
-            
-            scene = final_tags.get("scene", "")
-            if scene:
-                statistics["scene_frequency"][scene] = statistics["scene_frequency"].get(scene, 0) + 1
-            
-            emotion = final_tags.get("emotion", "")
-            if emotion:
-                statistics["emotion_frequency"][emotion] = statistics["emotion_frequency"].get(emotion, 0) + 1
-            
-            brand_elements = final_tags.get("brand_elements", "")
-            if brand_elements:
-                brands = [b.strip() for b in brand_elements.split(',') if b.strip()]
-                for brand in brands:
-                    statistics["brand_frequency"][brand] = statistics["brand_frequency"].get(brand, 0) + 1
-            
-            # 累计置信度
-            total_confidence += final_tags.get("confidence", 0.0)
-            
-            # 统计第二阶段触发率
-            stage2_result = result.get("stage2_result", {})
-            if stage2_result.get("triggered", False):
-                stage2_triggered += 1
-        
         # 计算平均值
-        statistics["average_confidence"] = total_confidence / len(successful_results)
-        statistics["stage2_trigger_rate"] = stage2_triggered / len(successful_results) * 100
+        statistics["average_confidence"] = stats["total_confidence"] / success_count
+        statistics["stage2_trigger_rate"] = stats["stage2_triggered"] / success_count * 100
         
         return statistics 
 
-def translate_json_file_with_deepseek(json_file_path: str) -> bool:
-    """直接对JSON文件进行DeepSeek翻译，翻译英文字段为中文"""
-    try:
-        import json
-        import requests
-        import os
-        from pathlib import Path
-        
-        # 读取JSON文件
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # 需要翻译的字段
-        translate_fields = ['object', 'scene', 'emotion']
-        
-        # 检查是否需要翻译或智能推断
-        needs_translation = False
-        
-        for field in translate_fields:
-            if field in data and isinstance(data[field], str):
-                # 检查是否包含英文需要翻译
-                if any(c.isalpha() and ord(c) < 256 for c in data[field]):
-                    needs_translation = True
-                    break
-        
-        # 特别检查emotion字段是否需要智能推断
-        if ('emotion' in data and 
-            data['emotion'].strip() in ['', '无', '[无]', '[enthusiastically]', '[无情绪]']):
-            needs_translation = True
-            print("🧠 检测到emotion字段需要智能推断")
-        
-        if not needs_translation:
-            print("✅ JSON文件已经是中文且emotion完整，无需处理")
-            return True
-        
-        print(f"🔄 开始翻译JSON文件: {json_file_path}")
-        
-        # 获取DeepSeek API密钥
-        api_key = os.getenv("DEEPSEEK_API_KEY")
-        if not api_key:
-            # 从配置文件获取
-            config_paths = [
-                Path(__file__).parent.parent.parent / "feishu_pool" / ".env",
-                Path(__file__).parent.parent / "config" / "env_config.txt"
-            ]
-            
-            for config_path in config_paths:
-                if config_path.exists():
-                    try:
-                        with open(config_path, 'r', encoding='utf-8') as f:
-                            for line in f:
-                                if line.strip().startswith('DEEPSEEK_API_KEY='):
-                                    api_key = line.split('=', 1)[1].strip()
-                                    if api_key.startswith('"') and api_key.endswith('"'):
-                                        api_key = api_key[1:-1]
-                                    elif api_key.startswith("'") and api_key.endswith("'"):
-                                        api_key = api_key[1:-1]
-                                    break
-                        if api_key:
-                            break
-                    except Exception:
-                        continue
-        
-        if not api_key:
-            print("❌ 未找到DeepSeek API密钥")
-            return False
-        
-        # 构造翻译请求
-        translation_content = []
-        for field in translate_fields:
-            if field in data:
-                translation_content.append(f"{field}: {data[field]}")
-        
-        content_to_translate = "\n".join(translation_content)
-        
-        # DeepSeek翻译提示词
-        translate_prompt = f"""请将以下视频分析结果翻译为中文标准格式：
+# 需要翻译的字段中出现Latin-1字母即视为含英文（与c.isalpha() and ord(c) < 256等价）
+_LATIN1_ALPHA_RE = re.compile(
+    '[' + ''.join(re.escape(chr(i)) for i in range(256) if chr(i).isalpha()) + ']'
+)
+# 需要翻译的字段，以及批量翻译时每次请求合并的文件数（控制在模型上下文窗口内）
+_TRANSLATE_FIELDS = ('object', 'scene', 'emotion')
+TRANSLATION_BATCH_SIZE = 20
+# emotion为以下占位值时需要DeepSeek智能推断
+_EMOTION_STUBS = frozenset(['', '无', '[无]', '[enthusiastically]', '[无情绪]'])
+# 翻译结果中归一为'无'的空值（不含'未知'等，避免已翻译的emotion再次被判为占位值）
+_TRANSLATION_NULL_TOKENS = frozenset(['无', 'none', 'null', ''])
 
-{content_to_translate}
+# DeepSeek翻译提示词（单文件/批量），调用时只做一次str.format替换
+_TRANSLATE_PROMPT_TEMPLATE = """请将以下视频分析结果翻译为中文标准格式：
+
+{content}
 
 要求：
 1. object字段：翻译为"主语+动词+宾语"的中文格式，去除方括号
@@ -2793,6 +3077,318 @@ emotion: 中文情绪词
 
 直接输出翻译结果，不要额外解释，不要使用方括号："""
 
+_BATCH_TRANSLATE_PROMPT_TEMPLATE = """请将以下{count}条视频分析结果分别翻译为中文标准格式：
+
+{content}
+
+要求：
+1. object字段：翻译为"主语+动词+宾语"的中文格式，去除方括号
+2. scene字段：翻译为简洁的中文场景描述，去除方括号
+3. emotion字段：翻译为单个中文情绪词，去除方括号
+4. 保持原有的分析含义不变，各条之间互不影响
+
+🧠 **智能emotion推断**：
+如果某条的emotion字段为空、"无"或"[无]"，请根据该条object和scene的内容智能推断合适的情绪：
+- 拍手、笑容、玩耍 → 开心、兴奋、快乐
+- 哭泣、拒绝、不安 → 伤心、不安、焦虑  
+- 喝奶、吃饭、睡觉 → 满足、安静、舒适
+- 教室、学习环境 → 专注、好奇、积极
+- 家庭环境、亲子互动 → 温馨、安全、愉悦
+
+以JSON格式输出（只包含原有字段，值中不要使用方括号）：
+{{"items": [{{"id": 1, "object": "中文主语+动词+宾语", "scene": "中文场景描述", "emotion": "中文情绪词"}}]}}"""
+
+# 提示词版本：参与翻译缓存键，修改提示词后旧译文自动失效
+_TRANSLATE_PROMPT_VERSION = hashlib.sha1(
+    (_TRANSLATE_PROMPT_TEMPLATE + _BATCH_TRANSLATE_PROMPT_TEMPLATE).encode('utf-8')
+).hexdigest()[:12]
+
+# 翻译请求复用的HTTP连接池（keep-alive），批量翻译时避免每个文件重新进行TCP+TLS握手
+_DEEPSEEK_SESSION = requests.Session()
+_DEEPSEEK_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+
+
+class _TranslationCache:
+    """
+    DeepSeek翻译结果的持久化缓存（SQLite）
+    
+    translation表：键为sha1(提示词版本 + 字段名 + 原文)，值为清理后的中文字段值；跨进程、跨批次复用。
+    processed表：已成功处理的JSON文件路径 → 处理后的mtime_ns，未修改的文件可跳过读取解析。
+    读写失败只记录警告并按未命中处理，不影响翻译流程。
+    """
+    
+    def __init__(self):
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """首次使用时在缓存目录下打开数据库"""
+        if self._conn is None:
+            cache_dir = Path(get_output_config()["cache_dir"])
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(cache_dir / "deepseek_translation.sqlite"), check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS translation (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS processed (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    @staticmethod
+    def make_key(field: str, source: str) -> str:
+        return hashlib.sha1(f"{_TRANSLATE_PROMPT_VERSION}\n{field}\n{source}".encode('utf-8')).hexdigest()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """批量查询，返回命中的{key: value}"""
+        if not keys:
+            return {}
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    f"SELECT key, value FROM translation WHERE key IN ({','.join('?' * len(keys))})",
+                    keys
+                ).fetchall()
+            return dict(rows)
+        except Exception as e:
+            logger.warning(f"⚠️ 读取翻译缓存失败: {e}")
+            return {}
+    
+    def set_many(self, items: Dict[str, str]):
+        """批量写入{key: value}"""
+        if not items:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.executemany("INSERT OR REPLACE INTO translation (key, value) VALUES (?, ?)", items.items())
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ 写入翻译缓存失败: {e}")
+    
+    def get_processed_mtime(self, path: str) -> Optional[int]:
+        """查询文件上次成功处理后的mtime_ns"""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT mtime_ns FROM processed WHERE path = ?", (path,)
+                ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.warning(f"⚠️ 读取翻译处理索引失败: {e}")
+            return None
+    
+    def set_processed_mtime(self, path: str, mtime_ns: Optional[int]):
+        """记录文件处理后的mtime_ns；mtime_ns为None时移除记录"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                if mtime_ns is None:
+                    conn.execute("DELETE FROM processed WHERE path = ?", (path,))
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO processed (path, mtime_ns) VALUES (?, ?)", (path, mtime_ns)
+                    )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ 写入翻译处理索引失败: {e}")
+
+
+_TRANSLATION_CACHE = _TranslationCache()
+
+
+def _translation_cache_keys(data: Dict[str, Any], translate_fields) -> Dict[str, str]:
+    """
+    为待翻译字段生成缓存键
+    
+    emotion为占位值时译文由object和scene推断而来，键中一并包含二者的原文
+    """
+    cache_keys = {}
+    for field in translate_fields:
+        if field not in data:
+            continue
+        source = str(data[field])
+        if field == 'emotion' and source.strip() in _EMOTION_STUBS:
+            source = '\n'.join([source, str(data.get('object', '')), str(data.get('scene', ''))])
+        cache_keys[field] = _TranslationCache.make_key(field, source)
+    return cache_keys
+
+
+def _is_unchanged_since_processed(json_file_path: str) -> bool:
+    """文件自上次成功处理后是否未被修改（mtime_ns一致）"""
+    try:
+        mtime_ns = os.stat(json_file_path).st_mtime_ns
+    except OSError:
+        return False
+    return _TRANSLATION_CACHE.get_processed_mtime(str(Path(json_file_path).resolve())) == mtime_ns
+
+
+def _record_processed(json_file_path: str, success: bool):
+    """成功时记录处理后（可能已被改写）的mtime，失败时使记录失效"""
+    processed_mtime = None
+    if success:
+        try:
+            processed_mtime = os.stat(json_file_path).st_mtime_ns
+        except OSError:
+            pass
+    _TRANSLATION_CACHE.set_processed_mtime(str(Path(json_file_path).resolve()), processed_mtime)
+
+
+def _peek_translate_fields(json_file_path: str) -> Optional[Dict[str, str]]:
+    """
+    流式读取顶层的object/scene/emotion字段，读齐即停止，不构建其余子树
+    
+    未安装ijson、字段值不是字符串或解析出错时返回None，由调用方完整解析
+    """
+    if not _IJSON_AVAILABLE:
+        return None
+    
+    fields = {}
+    try:
+        with open(json_file_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix not in _TRANSLATE_FIELDS:
+                    continue
+                if event != 'string':
+                    return None
+                fields[prefix] = value
+                if len(fields) == len(_TRANSLATE_FIELDS):
+                    break
+    except Exception:
+        return None
+    return fields
+
+
+def _load_for_translation(json_file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    读取需要翻译的JSON数据；无需翻译或智能推断时返回None
+    
+    先流式检查顶层字段，无需处理的文件不做完整解析
+    """
+    data = None
+    fields = _peek_translate_fields(json_file_path)
+    if fields is None:
+        data = load_json(json_file_path)
+        fields = data
+    
+    if not _needs_deepseek_translation(fields):
+        print(f"✅ JSON文件已经是中文且emotion完整，无需处理: {json_file_path}")
+        return None
+    
+    return data if data is not None else load_json(json_file_path)
+
+
+def _needs_deepseek_translation(data: Dict[str, Any]) -> bool:
+    """检查是否需要翻译（字段含英文）或智能推断（emotion为占位值）"""
+    needs_translation = False
+    
+    for field in _TRANSLATE_FIELDS:
+        if field in data and isinstance(data[field], str):
+            # 检查是否包含英文需要翻译
+            if _LATIN1_ALPHA_RE.search(data[field]):
+                needs_translation = True
+                break
+    
+    # 特别检查emotion字段是否需要智能推断
+    if ('emotion' in data and 
+        data['emotion'].strip() in _EMOTION_STUBS):
+        needs_translation = True
+        print("🧠 检测到emotion字段需要智能推断")
+    
+    return needs_translation
+
+
+def _apply_cached_translation(json_file_path: str, data: Dict[str, Any], cache_keys: Dict[str, str]) -> bool:
+    """全部字段命中持久化翻译缓存时直接写回文件并返回True，跳过API调用"""
+    cached = _TRANSLATION_CACHE.get_many(list(cache_keys.values()))
+    if not cache_keys or not all(key in cached for key in cache_keys.values()):
+        return False
+    
+    for field, key in cache_keys.items():
+        data[field] = cached[key]
+        print(f"✅ 更新字段 {field}: {cached[key]} (缓存)")
+    dump_json(json_file_path, data)
+    print(f"✅ JSON文件翻译完成（命中翻译缓存）: {json_file_path}")
+    return True
+
+
+def _apply_translated_fields(
+    json_file_path: str,
+    data: Dict[str, Any],
+    cache_keys: Dict[str, str],
+    fields: Dict[str, Any]
+):
+    """对DeepSeek返回的字段值做格式清理，写回JSON文件并填充翻译缓存"""
+    translated = {}
+    for field, value in fields.items():
+        # 🔧 格式清理：与字段清理共用同一实现（方括号、引号、首尾逗号、空白）
+        value = _strip_field_markup(str(value))
+        
+        # 特殊处理（已是规范值如'无'时免去lower()复制）
+        if value in _TRANSLATION_NULL_TOKENS or value.lower() in _TRANSLATION_NULL_TOKENS:
+            value = '无'
+        
+        if field in _TRANSLATE_FIELDS and field in data:
+            data[field] = value
+            translated[cache_keys[field]] = value
+            print(f"✅ 更新字段 {field}: {value}")
+    
+    _TRANSLATION_CACHE.set_many(translated)
+    
+    # 保存翻译后的JSON
+    dump_json(json_file_path, data)
+    print(f"✅ JSON文件翻译完成: {json_file_path}")
+
+
+def translate_json_file_with_deepseek(json_file_path: str) -> bool:
+    """
+    直接对JSON文件进行DeepSeek翻译，翻译英文字段为中文
+    
+    文件自上次成功处理后未被修改（mtime_ns一致）时直接返回，不再读取解析
+    """
+    if _is_unchanged_since_processed(json_file_path):
+        print(f"✅ JSON文件自上次处理后未修改，跳过: {json_file_path}")
+        return True
+    
+    success = _translate_json_file(json_file_path)
+    _record_processed(json_file_path, success)
+    return success
+
+
+def _translate_json_file(json_file_path: str) -> bool:
+    """读取JSON文件，必要时调用DeepSeek翻译并写回"""
+    try:
+        # 读取JSON文件
+        data = _load_for_translation(json_file_path)
+        if data is None:
+            return True
+        
+        print(f"🔄 开始翻译JSON文件: {json_file_path}")
+        
+        cache_keys = _translation_cache_keys(data, _TRANSLATE_FIELDS)
+        if _apply_cached_translation(json_file_path, data, cache_keys):
+            return True
+        
+        # 获取DeepSeek API密钥（环境变量/配置文件探测结果进程内缓存，批量调用只解析一次）
+        api_key = _get_deepseek_api_key()
+        
+        if not api_key:
+            print("❌ 未找到DeepSeek API密钥")
+            return False
+        
+        # 构造翻译请求
+        translation_content = []
+        for field in _TRANSLATE_FIELDS:
+            if field in data:
+                translation_content.append(f"{field}: {data[field]}")
+        
+        content_to_translate = "\n".join(translation_content)
+        
+        # DeepSeek翻译提示词
+        translate_prompt = _TRANSLATE_PROMPT_TEMPLATE.format(content=content_to_translate)
+
         # 调用DeepSeek API
         payload = {
             "model": "deepseek-chat",
@@ -2807,7 +3403,7 @@ emotion: 中文情绪词
         }
         
         print("🚀 调用DeepSeek API进行翻译...")
-        response = requests.post(
+        response = _DEEPSEEK_SESSION.post(
             "https://api.deepseek.com/chat/completions",
             json=payload,
             headers=headers,
@@ -2820,40 +3416,15 @@ emotion: 中文情绪词
                 translated_text = result["choices"][0]["message"]["content"].strip()
                 print(f"✅ DeepSeek翻译结果: {translated_text}")
                 
-                # 解析翻译结果并应用格式清理
+                # 解析"字段: 值"格式的翻译结果
+                fields = {}
                 for line in translated_text.split('\n'):
                     line = line.strip()
                     if ':' in line:
                         field, value = line.split(':', 1)
-                        field = field.strip()
-                        value = value.strip()
-                        
-                        # 🔧 格式清理：移除方括号和多余符号
-                        value = value.replace('[', '').replace(']', '')
-                        value = value.replace('"', '').replace("'", '')
-                        
-                        # 清理逗号
-                        if value.startswith(','):
-                            value = value[1:]
-                        if value.endswith(','):
-                            value = value[:-1]
-                        
-                        # 清理空格
-                        value = ' '.join(value.split())
-                        
-                        # 特殊处理
-                        if value.lower().strip() in ['无', 'none', 'null', '']:
-                            value = '无'
-                        
-                        if field in translate_fields and field in data:
-                            data[field] = value
-                            print(f"✅ 更新字段 {field}: {value}")
-                
-                # 保存翻译后的JSON
-                with open(json_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                        fields[field.strip()] = value.strip()
                 
-                print(f"✅ JSON文件翻译完成: {json_file_path}")
+                _apply_translated_fields(json_file_path, data, cache_keys, fields)
                 return True
             else:
                 print("❌ DeepSeek API响应中没有choices字段")
@@ -2868,6 +3439,141 @@ emotion: 中文情绪词
         return False
 
 
+def _request_batch_translation(
+    items: List[Dict[str, Any]],
+    api_key: str
+) -> Optional[Dict[int, Dict[str, Any]]]:
+    """
+    将多个文件的待翻译字段合并为一次DeepSeek请求（JSON输出模式）
+    
+    返回{序号: {字段: 译文}}，序号从1开始与items顺序对应；请求或解析失败时返回None
+    """
+    lines = []
+    for i, data in enumerate(items, 1):
+        fields = "; ".join(f"{field}: {data[field]}" for field in _TRANSLATE_FIELDS if field in data)
+        lines.append(f"{i}) {fields}")
+    content_to_translate = "\n".join(lines)
+    
+    translate_prompt = _BATCH_TRANSLATE_PROMPT_TEMPLATE.format(
+        count=len(items), content=content_to_translate
+    )
+
+    payload = {
+        "model": "deepseek-chat",
+        "messages": [{"role": "user", "content": translate_prompt}],
+        "max_tokens": min(200 * len(items), 8000),
+        "temperature": 0.1,
+        "response_format": {"type": "json_object"}
+    }
+    
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    
+    try:
+        print(f"🚀 调用DeepSeek API批量翻译 {len(items)} 条...")
+        response = _DEEPSEEK_SESSION.post(
+            "https://api.deepseek.com/chat/completions",
+            json=payload,
+            headers=headers,
+            timeout=15 + 3 * len(items)
+        )
+        if response.status_code != 200:
+            print(f"❌ DeepSeek批量翻译失败，状态码: {response.status_code}")
+            return None
+        
+        result = response.json()
+        if not result.get("choices"):
+            print("❌ DeepSeek API响应中没有choices字段")
+            return None
+        
+        content = result["choices"][0]["message"]["content"]
+        parsed = orjson.loads(content) if _ORJSON_AVAILABLE else json.loads(content)
+        translations = {}
+        for item in parsed.get("items", []):
+            if not isinstance(item, dict):
+                continue
+            # 模型有时把序号返回为字符串（如"3"），统一转为整数
+            try:
+                item_id = int(item["id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            translations[item_id] = {k: v for k, v in item.items() if k in _TRANSLATE_FIELDS}
+        
+        missing = [i for i in range(1, len(items) + 1) if not translations.get(i)]
+        if missing:
+            logger.warning(f"⚠️ 批量翻译结果缺失 {len(missing)}/{len(items)} 条（序号: {missing}），将回退到单文件翻译")
+        return translations
+    
+    except Exception as e:
+        print(f"❌ DeepSeek批量翻译失败: {e}")
+        return None
+
+
+def translate_json_files_batch(
+    json_file_paths: List[str],
+    batch_size: int = TRANSLATION_BATCH_SIZE
+) -> Dict[str, bool]:
+    """
+    批量翻译多个JSON文件
+    
+    未修改、无需翻译或全部命中缓存的文件在本地处理；其余文件每batch_size个合并为一次
+    DeepSeek请求，分组请求失败或某条结果缺失时回退到单文件翻译。返回{文件路径: 是否成功}
+    """
+    results: Dict[str, bool] = {}
+    pending = []  # (文件路径, 数据, 缓存键)
+    
+    for json_file_path in json_file_paths:
+        if _is_unchanged_since_processed(json_file_path):
+            print(f"✅ JSON文件自上次处理后未修改，跳过: {json_file_path}")
+            results[json_file_path] = True
+            continue
+        
+        try:
+            data = _load_for_translation(json_file_path)
+            if data is None:
+                success = True
+            else:
+                cache_keys = _translation_cache_keys(data, _TRANSLATE_FIELDS)
+                success = _apply_cached_translation(json_file_path, data, cache_keys)
+                if not success:
+                    pending.append((json_file_path, data, cache_keys))
+                    continue
+        except Exception as e:
+            print(f"❌ JSON翻译失败: {json_file_path}: {e}")
+            success = False
+        
+        results[json_file_path] = success
+        _record_processed(json_file_path, success)
+    
+    if not pending:
+        return {json_file_path: results[json_file_path] for json_file_path in json_file_paths}
+    
+    api_key = _get_deepseek_api_key()
+    for start in range(0, len(pending), max(1, batch_size)):
+        group = pending[start:start + max(1, batch_size)]
+        translations = _request_batch_translation([data for _, data, _ in group], api_key) if api_key else None
+        
+        for i, (json_file_path, data, cache_keys) in enumerate(group, 1):
+            fields = translations.get(i) if translations else None
+            if fields:
+                try:
+                    _apply_translated_fields(json_file_path, data, cache_keys, fields)
+                    success = True
+                except Exception as e:
+                    print(f"❌ JSON翻译失败: {json_file_path}: {e}")
+                    success = False
+            else:
+                # 分组请求失败或该条结果缺失：回退到单文件翻译
+                success = _translate_json_file(json_file_path)
+            
+            results[json_file_path] = success
+            _record_processed(json_file_path, success)
+    
+    return {json_file_path: results[json_file_path] for json_file_path in json_file_paths}
+
+
 """
 # 🔄 原始 Google API 实现代码（已注释，保留作为参考）
 # 原来的 _call_gemini_video_api_new 方法实现
@@ -6,13 +6,76 @@
 """
 
 import os
+import re
+import functools
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# .env解析结果缓存：键为(文件路径, mtime_ns, 文件大小)，文件未变化时同一进程内不再重复解析
+_ENV_CACHE: Dict[Tuple[str, int, int], Dict[str, str]] = {}
+
+# 单次扫描整个文件的 KEY=VALUE 行解析正则：跳过空行和#注释行，键值两侧空白不计入
+_ENV_LINE_RE = re.compile(r'^(?![^\S\n]*#)[^\S\n]*([^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$', re.MULTILINE)
+
+
+def _as_bool(value: str) -> bool:
+    """将环境变量字符串解析为布尔值"""
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+
+# 视频配置类型转换表
+_COERCERS = {bool: _as_bool, int: int, float: float, str: str}
+
+# OSS配置项
+_OSS_CONFIG_KEYS = (
+    'OSS_ACCESS_KEY_ID',
+    'OSS_ACCESS_KEY_SECRET', 
+    'OSS_BUCKET_NAME',
+    'OSS_ENDPOINT',
+    'OSS_UPLOAD_DIR',
+    'ENABLE_OSS'
+)
+
+# 视频处理配置项及其类型（导入时即解析为转换函数）
+_VIDEO_CONFIG_COERCERS = {
+    key: _COERCERS[type_func]
+    for key, type_func in {
+        'VIDEO_MAX_SIZE_MB': int,
+        'VIDEO_SPEECH_RECOGNITION_ENGINE': str,
+        'VIDEO_PROCESSING_THREADS': int,
+        'MAX_FILES_PER_BATCH': int,
+        'MAX_VIDEO_DURATION_SECONDS': int,
+        'MIN_VIDEO_DURATION_SECONDS': int,
+        'DUAL_STAGE_ENABLED': bool,
+        'BRAND_DETECTION_THRESHOLD': float,
+        'VISUAL_ANALYSIS_CONFIDENCE': float
+    }.items()
+}
+
+
+def _cached_until_reload(method):
+    """
+    按加载代次缓存配置访问器的结果
+    
+    load_env_file重新加载后自动失效；返回浅拷贝，调用方修改结果不影响缓存
+    """
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self):
+        cached = self._accessor_cache.get(name)
+        if cached is None or cached[0] != self._load_generation:
+            cached = (self._load_generation, method(self))
+            self._accessor_cache[name] = cached
+        return dict(cached[1])
+    
+    return wrapper
+
+
 class EnvLoader:
     """环境变量加载器"""
     
@@ -25,6 +88,9 @@ class EnvLoader:
         """
         self.env_file = env_file
         self.loaded_vars = {}
+        # 配置访问器缓存：每次load_env_file后代次+1，旧缓存失效
+        self._load_generation = 0
+        self._accessor_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
         
     def load_env_file(self, project_root: Optional[str] = None) -> Dict[str, str]:
         """
@@ -48,43 +114,45 @@ class EnvLoader:
             return {}
         
         try:
-            with open(env_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            stat = env_path.stat()
+            cache_key = (str(env_path.resolve()), stat.st_mtime_ns, stat.st_size)
+            parsed = _ENV_CACHE.get(cache_key)
             
-            loaded_count = 0
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # 跳过注释和空行
-                if not line or line.startswith('#'):
-                    continue
-                
-                # 解析 KEY=VALUE 格式
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # 移除值两端的引号
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
-                    
-                    # 设置环境变量
-                    os.environ[key] = value
-                    self.loaded_vars[key] = value
-                    loaded_count += 1
-                    
-                    logger.debug(f"✅ 加载环境变量: {key}")
+            if parsed is None:
+                parsed = self._parse_env_text(env_path.read_text(encoding='utf-8'))
+                _ENV_CACHE[cache_key] = parsed
+            else:
+                logger.debug(f"♻️ .env 文件未变化，复用解析结果: {env_path}")
             
-            logger.info(f"✅ 成功加载 {loaded_count} 个环境变量")
+            # 一次性写入环境变量
+            os.environ.update(parsed)
+            self.loaded_vars.update(parsed)
+            self._load_generation += 1
+            
+            logger.info(f"✅ 成功加载 {len(parsed)} 个环境变量")
             return self.loaded_vars
             
         except Exception as e:
             logger.error(f"❌ 加载 .env 文件失败: {str(e)}")
             return {}
     
+    @staticmethod
+    def _parse_env_text(text: str) -> Dict[str, str]:
+        """解析 KEY=VALUE 格式的文本，返回变量字典（后出现的同名变量覆盖前者）"""
+        parsed = {}
+        # 统一换行符后用编译好的正则一次扫描全部行
+        for key, value in _ENV_LINE_RE.findall('\n'.join(text.splitlines())):
+            # 移除值两端的引号
+            if value[:1] in ('"', "'") and value.endswith(value[0]):
+                value = value[1:-1]
+            parsed[key] = value
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for key in parsed:
+                logger.debug(f"✅ 加载环境变量: {key}")
+        return parsed
+    
+    @_cached_until_reload
     def get_api_keys(self) -> Dict[str, str]:
         """获取AI API密钥，并映射到标准名称"""
         api_keys = {}
@@ -118,58 +186,32 @@ class EnvLoader:
         
         return api_keys
     
+    @_cached_until_reload
     def get_oss_config(self) -> Dict[str, Any]:
         """获取OSS配置"""
         oss_config = {}
         
-        oss_keys = [
-            'OSS_ACCESS_KEY_ID',
-            'OSS_ACCESS_KEY_SECRET', 
-            'OSS_BUCKET_NAME',
-            'OSS_ENDPOINT',
-            'OSS_UPLOAD_DIR',
-            'ENABLE_OSS'
-        ]
-        
-        for key in oss_keys:
+        for key in _OSS_CONFIG_KEYS:
             value = os.getenv(key)
             if value:
                 # 处理布尔值
                 if key == 'ENABLE_OSS':
-                    oss_config[key] = value.lower() in ('true', '1', 'yes', 'on')
+                    oss_config[key] = _as_bool(value)
                 else:
                     oss_config[key] = value
         
         return oss_config
     
+    @_cached_until_reload
     def get_video_config(self) -> Dict[str, Any]:
         """获取视频处理配置"""
         video_config = {}
         
-        video_keys = {
-            'VIDEO_MAX_SIZE_MB': int,
-            'VIDEO_SPEECH_RECOGNITION_ENGINE': str,
-            'VIDEO_PROCESSING_THREADS': int,
-            'MAX_FILES_PER_BATCH': int,
-            'MAX_VIDEO_DURATION_SECONDS': int,
-            'MIN_VIDEO_DURATION_SECONDS': int,
-            'DUAL_STAGE_ENABLED': bool,
-            'BRAND_DETECTION_THRESHOLD': float,
-            'VISUAL_ANALYSIS_CONFIDENCE': float
-        }
-        
-        for key, type_func in video_keys.items():
+        for key, coerce in _VIDEO_CONFIG_COERCERS.items():
             value = os.getenv(key)
             if value:
                 try:
-                    if type_func == bool:
-                        video_config[key] = value.lower() in ('true', '1', 'yes', 'on')
-                    elif type_func == int:
-                        video_config[key] = int(value)
-                    elif type_func == float:
-                        video_config[key] = float(value)
-                    else:
-                        video_config[key] = value
+                    video_config[key] = coerce(value)
                 except ValueError as e:
                     logger.warning(f"⚠️ 配置 {key} 值格式错误: {value}")
         
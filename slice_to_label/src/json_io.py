@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+JSON文件读写工具 - 视频切片标签分析
+优先使用orjson（C实现，直接产出/解析UTF-8字节），orjson无法处理的数据回退到标准库json
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Union
+
+# 可选依赖：orjson以C实现JSON读写，缩进输出远快于json.dump(indent=2)
+try:
+    import orjson  # type: ignore
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+
+def _has_non_finite_float(obj: Any) -> bool:
+    """检查数据中是否含NaN/Infinity（orjson会把它们写成null，读回后变成None）"""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def dump_json(path: Union[str, Path], obj: Any) -> None:
+    """
+    以2空格缩进、保留中文的格式写入JSON文件
+
+    orjson不支持的数据（超过64位的整数、NaN/Infinity）交给json.dump，
+    保证写出的内容与标准库一致、可原样读回
+
+    Args:
+        path: 输出文件路径
+        obj: 要写入的数据
+    """
+    if _ORJSON_AVAILABLE and not _has_non_finite_float(obj):
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            data = None
+        if data is not None:
+            Path(path).write_bytes(data)
+            return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    读取JSON文件（优先使用orjson，NaN/Infinity等非严格JSON交给json模块解析）
+
+    注意：orjson把超过64位的整数解析为float，与json.load（解析为int）不同
+    """
+    if _ORJSON_AVAILABLE:
+        raw = Path(path).read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(raw.decode('utf-8'))
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,90 @@
+"""
+关键词多模式匹配器
+将一组关键词构建为Aho-Corasick自动机，单次扫描文本即可找出全部命中
+
+- 安装了pyahocorasick时使用C实现的自动机
+- 未安装时回退到逐关键词str.find，命中结果与自动机一致
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 可选依赖：pyahocorasick提供O(M)的单次多模式扫描
+try:
+    import ahocorasick  # type: ignore
+    _AHOCORASICK_AVAILABLE = True
+except ImportError:
+    _AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """
+    关键词匹配器
+
+    entries为(keyword, value)序列；同一关键词可对应多个value（例如属于多个类别）。
+    iter()与ahocorasick.Automaton.iter一致，逐个产出(结束下标, value)。
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        self._entries: Dict[str, list] = {}
+        for keyword, value in entries:
+            if keyword:
+                self._entries.setdefault(keyword, []).append(value)
+
+        self._automaton = None
+        if _AHOCORASICK_AVAILABLE and self._entries:
+            automaton = ahocorasick.Automaton()
+            for keyword, values in self._entries.items():
+                automaton.add_word(keyword, tuple(values))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """产出文本中每一处关键词命中的(结束下标, value)"""
+        if not text or not self._entries:
+            return
+        if self._automaton is not None:
+            for end, values in self._automaton.iter(text):
+                for value in values:
+                    yield end, value
+            return
+        for keyword, values in self._entries.items():
+            start = text.find(keyword)
+            while start != -1:
+                for value in values:
+                    yield start + len(keyword) - 1, value
+                start = text.find(keyword, start + 1)
+
+    def has_match(self, text: str) -> bool:
+        """文本中是否至少命中一个关键词（命中即停止扫描）"""
+        return next(iter(self.iter(text)), None) is not None
+
+    def first(self, text: str, default: Optional[Any] = None) -> Any:
+        """
+        value为(priority, label)时，返回priority最小的命中label
+
+        用于保留原有"按字典顺序逐个判断、先命中先返回"的优先级语义
+        """
+        best = None
+        for _, value in self.iter(text):
+            if best is None or value[0] < best[0]:
+                best = value
+        return best[1] if best is not None else default
+
+    def first_by_category(self, text: str) -> Dict[str, Any]:
+        """
+        value为(category, priority, label)时，返回每个类别中priority最小的命中label
+
+        一次扫描同时完成多个if/elif判断链
+        """
+        best: Dict[str, Tuple[int, Any]] = {}
+        for _, (category, priority, label) in self.iter(text):
+            current = best.get(category)
+            if current is None or priority < current[0]:
+                best[category] = (priority, label)
+        return {category: label for category, (_, label) in best.items()}
@@ -8,11 +8,72 @@
 import cv2
 import numpy as np
 import logging
-from typing import List, Tuple, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import List, Tuple, Dict, Any, Iterator
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+
+def _quantized_histogram_numpy(frame: np.ndarray, shift: int) -> np.ndarray:
+    """BGR三通道各右移shift位量化后的联合直方图（L1归一化，NumPy实现）"""
+    levels = 256 >> shift
+    q = frame >> shift
+    idx = (q[..., 0].astype(np.intp) * levels + q[..., 1]) * levels + q[..., 2]
+    hist = np.bincount(idx.ravel(), minlength=levels ** 3).astype(np.float32)
+    total = hist.sum()
+    if total > 0:
+        hist /= total
+    return hist
+
+
+# 可选依赖：安装了numba时使用并行直方图内核，直接遍历uint8像素，无需色彩空间转换
+try:
+    from numba import njit, prange  # type: ignore
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+if _NUMBA_AVAILABLE:
+    @njit(parallel=True, nogil=True, fastmath=True, cache=True)
+    def _quantized_histogram(frame, shift, out):
+        """_quantized_histogram_numpy的Numba版本：按行分块并行，每块使用私有计数器后再归并"""
+        h, w = frame.shape[0], frame.shape[1]
+        levels = 256 >> shift
+        bins = out.shape[0]
+        n_chunks = min(h, 64)
+        rows_per_chunk = (h + n_chunks - 1) // n_chunks
+        partial = np.zeros((n_chunks, bins), dtype=np.int64)
+        for c in prange(n_chunks):
+            for y in range(c * rows_per_chunk, min(h, (c + 1) * rows_per_chunk)):
+                for x in range(w):
+                    b = np.int64(frame[y, x, 0]) >> shift
+                    g = np.int64(frame[y, x, 1]) >> shift
+                    r = np.int64(frame[y, x, 2]) >> shift
+                    partial[c, (b * levels + g) * levels + r] += 1
+        total = 0
+        for k in range(bins):
+            count = 0
+            for c in range(n_chunks):
+                count += partial[c, k]
+            out[k] = count
+            total += count
+        if total > 0:
+            for k in range(bins):
+                out[k] /= total
+
+    # 导入时预编译，避免首次提取时在请求路径上触发JIT
+    try:
+        _warmup = np.zeros((4, 4, 3), dtype=np.uint8)
+        _quantized_histogram(_warmup, 5, np.empty(512, dtype=np.float32))
+        # 降采样后的跨步视图是非连续数组，需要单独的特化版本
+        _quantized_histogram(_warmup[::2, ::2], 5, np.empty(512, dtype=np.float32))
+    except Exception as e:
+        logger.warning(f"⚠️ Numba直方图内核编译失败，使用NumPy实现: {e}")
+        _NUMBA_AVAILABLE = False
+
+
 class SmartFrameExtractor:
     """
     智能关键帧提取器
@@ -32,7 +93,15 @@ class SmartFrameExtractor:
         
         # 内容变化检测阈值
         self.content_change_threshold = 0.3
-        self.histogram_bins = 32
+        # 每通道量化级数（需为2的幂）：8x8x8的BGR联合直方图足以区分镜头切换
+        self.histogram_bins = 8
+        # 相邻目标帧间隔不超过该值时顺序grab()前进，超过时才seek（seek需从关键帧重新解码）
+        self.max_grab_gap = 120
+        # 内容分析时解码与直方图流水线并行，解码缓冲区轮转数量（即最多在途帧数）
+        self.pipeline_buffers = 4
+        # 像素数超过该值的帧按histogram_stride跨步降采样后再统计直方图（颜色分布基本不变）
+        self.histogram_downsample_pixels = 250_000
+        self.histogram_stride = 4
         
     def extract_key_frames(self, video_path: str) -> List[Dict[str, Any]]:
         """
@@ -102,6 +171,42 @@ class SmartFrameExtractor:
         
         return key_frames
     
+    def _iter_frames_at(self, cap, frame_indices: List[int], buffer_count: int = 0) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        按帧号升序读取指定帧，产出(帧号, 帧)
+        
+        目标帧间隔较小时用grab()顺序前进，避免每次seek都回到关键帧重新解码；
+        重复的帧号各产出一次，读取失败的帧跳过。
+        buffer_count>0时帧轮流解码到buffer_count块复用的缓冲区，产出的帧在之后第
+        buffer_count次成功读取时被覆盖，调用方需要保留的帧必须自行copy()
+        """
+        position = None  # 下一次read()将返回的帧号；None表示位置未知
+        last_idx, last_frame = None, None
+        buffers = [None] * buffer_count  # 复用的解码缓冲区，首次解码后确定尺寸
+        slot = 0
+        
+        for frame_idx in sorted(frame_indices):
+            if frame_idx == last_idx:
+                yield frame_idx, last_frame
+                continue
+            
+            if position is not None and 0 <= frame_idx - position <= self.max_grab_gap:
+                while position < frame_idx and cap.grab():
+                    position += 1
+            if position != frame_idx:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            
+            ret, frame = cap.read(buffers[slot]) if buffers else cap.read()
+            if not ret:
+                position = None
+                continue
+            position = frame_idx + 1
+            if buffers:
+                buffers[slot] = frame
+                slot = (slot + 1) % buffer_count
+            last_idx, last_frame = frame_idx, frame
+            yield frame_idx, frame
+    
     def _extract_time_distributed(self, cap, fps: float, total_frames: int, strategy: Dict[str, Any]) -> List[Dict[str, Any]]:
         """时间均匀分布提取"""
         key_frames = []
@@ -109,24 +214,24 @@ class SmartFrameExtractor:
         
         if target_count == 1:
             # 只取中间帧
-            frame_indices = [total_frames // 2]
+            indices = np.array([total_frames // 2], dtype=np.int64)
         else:
-            # 均匀分布
-            step = total_frames // target_count
-            frame_indices = [i * step for i in range(target_count)]
-        
-        for i, frame_idx in enumerate(frame_indices):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
-            if ret:
-                timestamp = frame_idx / fps
-                key_frames.append({
-                    "frame": frame,
-                    "frame_index": frame_idx,
-                    "timestamp": timestamp,
-                    "extraction_method": "time_distributed",
-                    "confidence": 0.9
-                })
+            # 均匀分布：首尾帧都覆盖
+            indices = np.linspace(0, total_frames - 1, target_count, dtype=np.int64)
+        
+        # 时间戳一次性向量化计算；tolist()转为原生int/float，避免NumPy标量装箱
+        frame_indices = indices.tolist()
+        timestamps = dict(zip(frame_indices, (indices.astype(np.float64) / fps).tolist()))
+        
+        for frame_idx, frame in self._iter_frames_at(cap, frame_indices):
+            timestamp = timestamps[frame_idx]
+            key_frames.append({
+                "frame": frame,
+                "frame_index": frame_idx,
+                "timestamp": timestamp,
+                "extraction_method": "time_distributed",
+                "confidence": 0.9
+            })
         
         return key_frames
     
@@ -135,17 +240,23 @@ class SmartFrameExtractor:
         key_frames = []
         
         # 首先获取所有帧的直方图
-        histograms = []
-        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-        
         frame_step = max(1, total_frames // 50)  # 最多采样50个点进行内容分析
         
-        for frame_idx in range(0, total_frames, frame_step):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
-            if ret:
-                hist = self._calculate_histogram(frame)
-                histograms.append((frame_idx, hist))
+        # 单次顺序解码，采样点之间只grab()不做颜色转换；帧只用于直方图，轮转复用缓冲区。
+        # 主线程解码的同时由后台线程计算上一帧直方图（解码与Numba内核均释放GIL）
+        n_buffers = max(2, self.pipeline_buffers)
+        sample_indices = []
+        futures = []
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            frames = self._iter_frames_at(cap, range(0, total_frames, frame_step), buffer_count=n_buffers)
+            for frame_idx, frame in frames:
+                sample_indices.append(frame_idx)
+                futures.append(pool.submit(self._calculate_histogram, frame))
+                # 下一次解码将写入第len(futures)-n_buffers个采样帧所在的缓冲区，先等它的直方图算完
+                reused = len(futures) - n_buffers
+                if reused >= 0:
+                    futures[reused].result()
+            histograms = [(frame_idx, future.result()) for frame_idx, future in zip(sample_indices, futures)]
         
         # 检测内容变化点
         change_points = self._detect_content_changes(histograms)
@@ -154,18 +265,15 @@ class SmartFrameExtractor:
         selected_indices = self._select_representative_frames(change_points, total_frames, strategy)
         
         # 提取选定的帧
-        for frame_idx in selected_indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
-            if ret:
-                timestamp = frame_idx / fps
-                key_frames.append({
-                    "frame": frame,
-                    "frame_index": frame_idx,
-                    "timestamp": timestamp,
-                    "extraction_method": "content_aware",
-                    "confidence": 0.85
-                })
+        for frame_idx, frame in self._iter_frames_at(cap, selected_indices):
+            timestamp = frame_idx / fps
+            key_frames.append({
+                "frame": frame,
+                "frame_index": frame_idx,
+                "timestamp": timestamp,
+                "extraction_method": "content_aware",
+                "confidence": 0.85
+            })
         
         return key_frames
     
@@ -192,33 +300,40 @@ class SmartFrameExtractor:
         return unique_frames[:strategy["max_frames"]]
     
     def _calculate_histogram(self, frame: np.ndarray) -> np.ndarray:
-        """计算帧的颜色直方图"""
-        # 转换为HSV色彩空间
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        # 计算3D直方图
-        hist = cv2.calcHist([hsv], [0, 1, 2], None, 
-                           [self.histogram_bins, self.histogram_bins, self.histogram_bins],
-                           [0, 180, 0, 256, 0, 256])
-        
-        # 归一化
-        hist = cv2.normalize(hist, hist).flatten()
-        return hist
+        """计算帧的量化BGR颜色直方图（扁平float32，L1归一化）"""
+        # 每通道右移位数：256级量化为histogram_bins级
+        shift = (256 // self.histogram_bins).bit_length() - 1
+        
+        # 大尺寸帧只统计跨步视图（不拷贝），1080p时输入像素减少为1/16
+        if frame.shape[0] * frame.shape[1] > self.histogram_downsample_pixels:
+            stride = self.histogram_stride
+            frame = frame[::stride, ::stride]
+        
+        if _NUMBA_AVAILABLE:
+            hist = np.empty(self.histogram_bins ** 3, dtype=np.float32)
+            _quantized_histogram(frame, shift, hist)
+            return hist
+        return _quantized_histogram_numpy(frame, shift)
     
     def _detect_content_changes(self, histograms: List[Tuple[int, np.ndarray]]) -> List[int]:
         """检测内容变化点"""
         change_points = [histograms[0][0]]  # 总是包含第一帧
+        if len(histograms) < 2:
+            return change_points
         
-        for i in range(1, len(histograms)):
-            prev_hist = histograms[i-1][1]
-            curr_hist = histograms[i][1]
-            
-            # 计算直方图相关性
-            correlation = cv2.compareHist(prev_hist, curr_hist, cv2.HISTCMP_CORREL)
-            
-            # 如果相关性低于阈值，认为是内容变化点
-            if correlation < (1 - self.content_change_threshold):
-                change_points.append(histograms[i][0])
+        # 一次性计算所有相邻直方图的相关性（与cv2.HISTCMP_CORREL一致，方差为0时记为1）
+        stacked = np.stack([hist for _, hist in histograms]).astype(np.float64)
+        centered = stacked - stacked.mean(axis=1, keepdims=True)
+        numerator = np.einsum('ij,ij->i', centered[:-1], centered[1:])
+        sq_norms = np.einsum('ij,ij->i', centered, centered)
+        denominator = sq_norms[:-1] * sq_norms[1:]
+        valid = denominator > np.finfo(np.float64).eps
+        correlation = np.ones(len(histograms) - 1)
+        correlation[valid] = numerator[valid] / np.sqrt(denominator[valid])
+        
+        # 如果相关性低于阈值，认为是内容变化点
+        for i in np.flatnonzero(correlation < (1 - self.content_change_threshold)):
+            change_points.append(histograms[i + 1][0])
         
         return change_points
     
@@ -227,25 +342,22 @@ class SmartFrameExtractor:
         if len(change_points) <= strategy["max_frames"]:
             return change_points
         
-        # 如果变化点太多，均匀选择
-        step = len(change_points) // strategy["max_frames"]
-        selected = [change_points[i * step] for i in range(strategy["max_frames"])]
+        # 如果变化点太多，均匀选择（首尾变化点都保留）
+        positions = np.linspace(0, len(change_points) - 1, strategy["max_frames"], dtype=np.int64)
+        selected = np.asarray(change_points)[positions]
         
-        return selected
+        return selected.tolist()
     
     def _deduplicate_frames(self, frames: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """去除重复帧"""
-        seen_indices = set()
-        unique_frames = []
-        
+        # 同一帧号保留最先出现的帧
+        by_index: Dict[int, Dict[str, Any]] = {}
         for frame_data in frames:
-            frame_idx = frame_data["frame_index"]
-            if frame_idx not in seen_indices:
-                seen_indices.add(frame_idx)
-                unique_frames.append(frame_data)
+            by_index.setdefault(frame_data["frame_index"], frame_data)
         
         # 按时间戳排序
-        unique_frames.sort(key=lambda x: x["timestamp"])
+        unique_frames = list(by_index.values())
+        unique_frames.sort(key=itemgetter("timestamp"))
         return unique_frames
     
     def get_extraction_summary(self, key_frames: List[Dict[str, Any]]) -> Dict[str, Any]:
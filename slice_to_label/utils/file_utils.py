@@ -3,27 +3,31 @@
 """
 
 import os
-import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Union
 from pathlib import Path
 
+from src.json_io import dump_json, load_json
+
 logger = logging.getLogger(__name__)
 
 
 def scan_video_files(
     directory: str, 
-    supported_formats: Optional[List[str]] = None
-) -> List[str]:
+    supported_formats: Optional[List[str]] = None,
+    return_size: bool = False
+) -> List[Union[str, Tuple[str, int]]]:
     """
     扫描目录中的视频文件，并过滤无效文件
     
     Args:
         directory: 目录路径
         supported_formats: 支持的格式列表
+        return_size: 为True时返回(路径, 字节大小)元组，
+            大小取自DirEntry.stat()，可直接交给filter_files_by_size
         
     Returns:
-        视频文件路径列表
+        视频文件路径列表（return_size=True时为(路径, 字节大小)列表）
     """
     if supported_formats is None:
         supported_formats = ['.mp4', '.mov', '.avi', '.mkv', '.webm']
@@ -35,27 +39,47 @@ def scan_video_files(
         logger.error(f"目录不存在: {directory}")
         return video_files
     
-    def _should_filter_video_file(file_path: Path) -> bool:
-        """判断视频文件是否应该被过滤"""
-        # 🎯 用户反馈：多镜头视频也应该被分析，只过滤真正失败的文件
-        # 只过滤❌前缀的文件（分析失败），♻️文件允许正常分析
-        if file_path.stem.startswith("❌"):
-            return True
-        return False
+    formats = frozenset(supported_formats)
     
-    for file_path in Path(directory).rglob("*"):
-        if file_path.is_file() and file_path.suffix.lower() in supported_formats:
-            # 🚨 新增：过滤逻辑
-            if _should_filter_video_file(file_path):
-                filtered_count += 1
-                logger.debug(f"🚫 过滤视频文件: {file_path.name} (质量问题)")
-                continue
-            video_files.append(str(file_path))
+    # os.scandir迭代：先按文件名后缀筛选，只有候选视频文件才做类型判断，
+    # 目录不跟随符号链接（与Path.rglob一致）
+    pending = [str(Path(directory))]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # 与Path.suffix一致：以点开头或结尾的文件名没有后缀
+                    dot = name.rfind('.')
+                    suffix = name[dot:].lower() if 0 < dot < len(name) - 1 else ''
+                    path = name if current == '.' else os.path.join(current, name)
+                    
+                    if suffix in formats and entry.is_file():
+                        # 🚨 过滤逻辑
+                        # 🎯 用户反馈：多镜头视频也应该被分析，只过滤真正失败的文件
+                        # 只过滤❌前缀的文件（分析失败），♻️文件允许正常分析
+                        if name.startswith("❌"):
+                            filtered_count += 1
+                            logger.debug(f"🚫 过滤视频文件: {name} (质量问题)")
+                            continue
+                        if return_size:
+                            try:
+                                video_files.append((path, entry.stat().st_size))
+                            except OSError as e:
+                                logger.warning(f"无法获取文件大小: {path}, {e}")
+                        else:
+                            video_files.append(path)
+                    elif entry.is_dir(follow_symlinks=False):
+                        pending.append(path)
+        except OSError as e:
+            logger.debug(f"跳过无法访问的目录: {current} ({e})")
     
     if filtered_count > 0:
         logger.info(f"🚫 文件扫描过滤了 {filtered_count} 个质量问题视频文件")
     
-    return sorted(video_files)
+    video_files.sort()
+    return video_files
 
 
 def save_json_result(data: Dict[str, Any], output_file: str) -> bool:
@@ -71,8 +95,7 @@ def save_json_result(data: Dict[str, Any], output_file: str) -> bool:
     """
     try:
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        dump_json(output_file, data)
         return True
     except Exception as e:
         logger.error(f"保存JSON文件失败 {output_file}: {e}")
@@ -90,25 +113,26 @@ def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
         JSON数据或None
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json(file_path)
     except Exception as e:
         logger.error(f"加载JSON文件失败 {file_path}: {e}")
         return None
 
 
-def get_file_info(file_path: str) -> Dict[str, Any]:
+def get_file_info(file_path: str, *, stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
     """
     获取文件基本信息
     
     Args:
         file_path: 文件路径
+        stat: 调用方已有的stat结果（如DirEntry.stat()），传入时不再重复stat
         
     Returns:
         文件信息字典
     """
     try:
-        stat = os.stat(file_path)
+        if stat is None:
+            stat = os.stat(file_path)
         return {
             "path": file_path,
             "name": os.path.basename(file_path),
@@ -139,7 +163,7 @@ def ensure_output_directory(output_dir: str) -> str:
 
 
 def filter_files_by_size(
-    file_paths: List[str], 
+    file_paths: Iterable[Union[str, Tuple[str, int]]], 
     min_size_mb: float = 0.5, 
     max_size_mb: float = 100.0
 ) -> List[str]:
@@ -147,7 +171,8 @@ def filter_files_by_size(
     根据文件大小过滤文件
     
     Args:
-        file_paths: 文件路径列表
+        file_paths: 文件路径列表，或scan_video_files(return_size=True)
+            返回的(路径, 字节大小)元组（已知大小时不再stat）
         min_size_mb: 最小文件大小(MB)
         max_size_mb: 最大文件大小(MB)
         
@@ -156,9 +181,15 @@ def filter_files_by_size(
     """
     filtered_files = []
     
-    for file_path in file_paths:
+    for item in file_paths:
+        if isinstance(item, tuple):
+            file_path, size_bytes = item
+        else:
+            file_path, size_bytes = item, None
         try:
-            size_mb = os.path.getsize(file_path) / (1024 * 1024)
+            if size_bytes is None:
+                size_bytes = os.path.getsize(file_path)
+            size_mb = size_bytes / (1024 * 1024)
             if min_size_mb <= size_mb <= max_size_mb:
                 filtered_files.append(file_path)
             else:
@@ -15,7 +15,6 @@ import argparse
 import logging
 from pathlib import Path
 import re
-import json
 from datetime import datetime
 
 # 添加src目录到Python路径
@@ -29,11 +28,13 @@ try:
         get_deepseek_api_key, validate_config, get_config_summary,
         get_min_segment_duration, get_max_segment_duration
     )
+    from json_io import dump_json
 except ImportError:
     from src.env_loader import (
         get_deepseek_api_key, validate_config, get_config_summary,
         get_min_segment_duration, get_max_segment_duration
     )
+    from src.json_io import dump_json
 
 # 设置日志
 logging.basicConfig(
@@ -42,60 +43,82 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# AI分析缓存目录（与批量处理器默认temp_dir下的缓存共用）
+ANALYSIS_CACHE_DIR = Path("data/temp/ai_cache")
+
 def scan_temp_input_dir(input_dir: Path) -> tuple:
     """扫描临时输入目录，匹配SRT和视频文件对"""
     srt_files = []
     video_files = []
     
     # 支持的视频格式
-    supported_formats = ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.wmv', '.flv']
+    supported_formats = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.wmv', '.flv'}
+    
+    # os.scandir的DirEntry自带文件类型，先按后缀筛选，只对候选文件判断is_file
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            suffix = os.path.splitext(entry.name)[1].lower()
+            if suffix == '.srt':
+                if entry.is_file():
+                    srt_files.append(input_dir / entry.name)
+            elif suffix in supported_formats and entry.is_file():
+                video_files.append(input_dir / entry.name)
     
-    for file_path in input_dir.iterdir():
-        if file_path.is_file():
-            if file_path.suffix.lower() == '.srt':
-                srt_files.append(file_path)
-            elif file_path.suffix.lower() in supported_formats:
-                video_files.append(file_path)
+    # 匹配文件对：按文件名(stem)建立索引，同名优先，其次匹配最长的视频名前缀
+    video_by_stem = {}
+    for video_file in video_files:
+        video_by_stem.setdefault(video_file.stem, video_file)
     
-    # 匹配文件对
     matched_pairs = []
     for srt_file in srt_files:
         srt_stem = srt_file.stem
-        # 查找匹配的视频文件
-        for video_file in video_files:
-            video_stem = video_file.stem
-            if srt_stem == video_stem or srt_stem.startswith(video_stem):
+        for end in range(len(srt_stem), 0, -1):
+            video_file = video_by_stem.get(srt_stem[:end])
+            if video_file is not None:
                 matched_pairs.append((srt_file, video_file))
                 break
     
     return matched_pairs
 
-def generate_simplified_json_report(segment_info: dict, video_file: Path, output_file: Path) -> Path:
-    """生成简化的JSON分析报告"""
+# 主题关键词 -> 品牌类型，按优先级排列（先命中先返回）
+_BRAND_RULES = (
+    ('蕴淳', '启赋蕴淳'),
+    ('水奶', '启赋水奶'),
+    ('蓝钻', '启赋蓝钻'),
+    ('启赋', '启赋蕴淳'),  # 默认归类
+)
+
+def format_report_timestamp(seconds: float) -> str:
+    """格式化为MM:SS.mmm（按毫秒四舍五入，避免浮点取余导致的截断误差）"""
+    secs, millis = divmod(round(seconds * 1000), 1000)
+    minutes, secs = divmod(secs, 60)
+    return f"{minutes:02d}:{secs:02d}.{millis:03d}"
+
+def generate_simplified_json_report(segment_info: dict, video_file: Path, output_file: Path,
+                                    creation_time: str = None) -> Path:
+    """
+    生成简化的JSON分析报告
+    
+    creation_time为本次运行的ISO时间戳，批量生成时由调用方统一传入；未传入时取当前时间
+    """
     
     # 提取品牌类型
     topic = segment_info.get('topic', '')
-    product_brand_type = "未分类"
-    if '蕴淳' in topic:
-        product_brand_type = "启赋蕴淳"
-    elif '水奶' in topic:
-        product_brand_type = "启赋水奶"  
-    elif '蓝钻' in topic:
-        product_brand_type = "启赋蓝钻"
-    elif '启赋' in topic:
-        product_brand_type = "启赋蕴淳"  # 默认归类
+    product_brand_type = next(
+        (brand for keyword, brand in _BRAND_RULES if keyword in topic), "未分类"
+    )
         
     # 构建简化JSON结构
     report = {
         "basic_info": {
             "file_name": output_file.name,
             "original_video": video_file.name,
-            "creation_time": datetime.now().isoformat(),
+            "creation_time": creation_time or datetime.now().isoformat(),
             "processing_version": "v2.0"
         },
         "timing_info": {
-            "start_time": f"{int(segment_info.get('start_time', 0))//60:02d}:{int(segment_info.get('start_time', 0))%60:02d}.{int((segment_info.get('start_time', 0) % 1) * 1000):03d}",
-            "end_time": f"{int(segment_info.get('end_time', 0))//60:02d}:{int(segment_info.get('end_time', 0))%60:02d}.{int((segment_info.get('end_time', 0) % 1) * 1000):03d}",
+            "start_time": format_report_timestamp(segment_info.get('start_time', 0)),
+            "end_time": format_report_timestamp(segment_info.get('end_time', 0)),
             "duration_seconds": round(segment_info.get('duration', 0), 2),
             "srt_segment_range": f"片段 {'-'.join(map(str, segment_info.get('sequence_ids', [])))}"
         },
@@ -105,19 +128,19 @@ def generate_simplified_json_report(segment_info: dict, video_file: Path, output
             "product_categories": ["婴幼儿奶粉", "营养补充"],
             "key_selling_points": segment_info.get('keywords', []),
             "product_brand_type": product_brand_type,
-            "topic": segment_info.get('topic', ''),
+            "topic": topic,
             "logic_pattern": segment_info.get('logic_pattern', '产品介绍型')
         }
     }
     
     # 保存JSON报告
     json_report_path = output_file.with_suffix('.json')
-    with open(json_report_path, 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    dump_json(json_report_path, report)
     
     return json_report_path
 
-def process_temp_input_mode(input_dir: Path, output_dir: Path, api_key: str) -> int:
+def process_temp_input_mode(input_dir: Path, output_dir: Path, api_key: str,
+                            use_cache: bool = True) -> int:
     """处理临时输入目录模式"""
     
     print(f"🔍 扫描输入目录: {input_dir}")
@@ -139,6 +162,7 @@ def process_temp_input_mode(input_dir: Path, output_dir: Path, api_key: str) ->
         from srt_parser import SRTParser
         from deepseek_analyzer import DeepSeekAnalyzer  
         from video_generator import VideoGenerator
+        from analysis_cache import AnalysisCache
         
         # 初始化组件
         srt_parser = SRTParser()
@@ -147,9 +171,14 @@ def process_temp_input_mode(input_dir: Path, output_dir: Path, api_key: str) ->
             input_dir=str(input_dir),
             output_dir=str(output_dir)
         )
+        # AI分析缓存：内容未变化的SRT不再重复调用DeepSeek
+        analysis_cache = AnalysisCache(ANALYSIS_CACHE_DIR) if use_cache else None
         
         print("\n🚀 开始处理...")
         
+        # 本次运行的创建时间，所有切片报告共用
+        run_timestamp = datetime.now().isoformat()
+        
         total_slices = 0
         success_count = 0
         
@@ -158,14 +187,24 @@ def process_temp_input_mode(input_dir: Path, output_dir: Path, api_key: str) ->
             
             # 1. 解析SRT
             print(f"  📄 解析字幕...")
-            segments = srt_parser.parse_srt_file(srt_file)
+            segments, srt_hash = srt_parser.parse_srt_file(srt_file, return_hash=True)
             if not segments:
                 print(f"  ❌ SRT解析失败")
                 continue
             
-            # 2. AI分析
-            print(f"  🤖 AI分析（DeepSeek）...")
-            product_segments = ai_analyzer.analyze_srt_content(segments, srt_file.name)
+            # 2. AI分析（优先命中缓存）
+            cache_key = None
+            product_segments = None
+            if analysis_cache is not None:
+                cache_key = AnalysisCache.make_key(srt_hash, ai_analyzer, srt_file.name)
+                product_segments = analysis_cache.get(cache_key)
+            if product_segments is not None:
+                print(f"  ⚡ 命中AI分析缓存")
+            else:
+                print(f"  🤖 AI分析（DeepSeek）...")
+                product_segments = ai_analyzer.analyze_srt_content(segments, srt_file.name)
+                if product_segments and cache_key is not None:
+                    analysis_cache.set(cache_key, product_segments)
             if not product_segments:
                 print(f"  ❌ 未识别到产品介绍片段")
                 continue
@@ -207,7 +246,9 @@ def process_temp_input_mode(input_dir: Path, output_dir: Path, api_key: str) ->
                         print(f"    🎯 置信度: {segment.confidence:.2f}")
                         
                         # 生成简化JSON报告
-                        json_path = generate_simplified_json_report(segment_info, video_file, output_file)
+                        json_path = generate_simplified_json_report(
+                            segment_info, video_file, output_file, creation_time=run_timestamp
+                        )
                         print(f"    📊 分析报告: {json_path.name}")
                         
                         total_slices += 1
@@ -272,6 +313,12 @@ def main():
         help="DeepSeek API密钥 (可选，优先使用环境变量)"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"不使用AI分析缓存，强制重新调用DeepSeek (缓存目录: {ANALYSIS_CACHE_DIR})"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -325,7 +372,7 @@ def main():
         print("=" * 60)
     
     # 处理临时输入目录
-    return process_temp_input_mode(input_dir, output_dir, api_key)
+    return process_temp_input_mode(input_dir, output_dir, api_key, use_cache=not args.no_cache)
 
 if __name__ == "__main__":
     sys.exit(main()) 
\ No newline at end of file
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+AI分析结果缓存 - SRT转产品介绍视频
+按SRT内容哈希缓存DeepSeek分析结果，内容未变化的SRT重复运行时跳过API调用
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
+try:
+    from .deepseek_analyzer import ProductSegment
+    from .json_io import dump_json, load_json
+except ImportError:
+    from deepseek_analyzer import ProductSegment
+    from json_io import dump_json, load_json
+
+logger = logging.getLogger(__name__)
+
+# 缓存格式版本：ProductSegment字段或分析逻辑变化时递增，使旧缓存失效
+CACHE_VERSION = 1
+
+
+class AnalysisCache:
+    """DeepSeek分析结果磁盘缓存（每个缓存键一个JSON文件）"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        初始化分析缓存
+
+        Args:
+            cache_dir: 缓存目录
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(srt_hash: str, analyzer, filename: str) -> str:
+        """
+        生成缓存键
+
+        除SRT内容外，还包含影响分析结果的模型参数与文件名（文件名会写入prompt）
+
+        Args:
+            srt_hash: SRT文件内容的sha256十六进制摘要
+            analyzer: DeepSeekAnalyzer实例
+            filename: 传给analyze_srt_content的文件名
+        """
+        fingerprint = json.dumps([
+            CACHE_VERSION, srt_hash, filename,
+            analyzer.model, analyzer.max_tokens, analyzer.temperature,
+            analyzer.product_keywords, analyzer.brand_keywords,
+            analyzer.min_duration, analyzer.max_duration
+        ], ensure_ascii=False)
+        return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[List[ProductSegment]]:
+        """读取缓存的分析结果，未命中或缓存损坏时返回None"""
+        cache_file = self.cache_dir / f"{key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            return [
+                ProductSegment(
+                    topic=item['topic'],
+                    sequence_ids=item['sequence_ids'],
+                    summary=item['summary'],
+                    keywords=item['keywords'],
+                    logic_pattern=item['logic_pattern'],
+                    confidence=item['confidence'],
+                    start_time=item['start_time'],
+                    end_time=item['end_time'],
+                    scene_type=item['scene_type']
+                )
+                for item in load_json(cache_file)
+            ]
+        except Exception as e:
+            logger.warning(f"读取分析缓存失败 {cache_file.name}: {e}")
+            return None
+
+    def set(self, key: str, segments: List[ProductSegment]):
+        """写入分析结果（先写临时文件再原子替换，并发读取不会看到半写入的文件）"""
+        cache_file = self.cache_dir / f"{key}.json"
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{id(segments)}.tmp")
+        try:
+            dump_json(tmp_file, [
+                {
+                    'topic': s.topic,
+                    'sequence_ids': s.sequence_ids,
+                    'summary': s.summary,
+                    'keywords': s.keywords,
+                    'logic_pattern': s.logic_pattern,
+                    'confidence': s.confidence,
+                    'start_time': s.start_time,
+                    'end_time': s.end_time,
+                    'scene_type': s.scene_type
+                }
+                for s in segments
+            ])
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"写入分析缓存失败 {cache_file.name}: {e}")
+            tmp_file.unlink(missing_ok=True)
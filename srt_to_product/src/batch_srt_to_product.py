@@ -4,9 +4,11 @@
 协调整个处理流程：SRT解析 -> AI分析 -> 视频生成
 """
 
-import json
 import logging
+import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
@@ -16,26 +18,43 @@ try:
     from .deepseek_analyzer import DeepSeekAnalyzer
     from .video_generator import VideoGenerator
     from .env_loader import validate_config, get_config_summary
+    from .json_io import dump_json
+    from .analysis_cache import AnalysisCache
 except ImportError:
     from srt_parser import SRTParser
     from deepseek_analyzer import DeepSeekAnalyzer
     from video_generator import VideoGenerator
     from env_loader import validate_config, get_config_summary
+    from json_io import dump_json
+    from analysis_cache import AnalysisCache
 
 logger = logging.getLogger(__name__)
 
+# 支持的原始视频格式（后缀统一按小写比较）
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.webm', '.wmv', '.flv'})
+
+# 产品切片SRT的文件名关键词（编译为单个正则，一次扫描完成全部判断）
+_EXCLUDE_KEYWORDS = ('启赋蕴淳', '启赋水奶', '启赋蓝钻', '_product', '产品介绍', '核心配方', '便携')
+_EXCLUDE_RE = re.compile('|'.join(map(re.escape, _EXCLUDE_KEYWORDS)))
+
 class BatchSRTToProductProcessor:
     """批量SRT转产品介绍视频处理器"""
     
-    def __init__(self, input_video_dir: str, api_key: Optional[str] = None):
+    # 并发处理的SRT文件数（主要耗时在DeepSeek请求与ffmpeg子进程，均不占用GIL）
+    BATCH_MAX_WORKERS = 8
+    
+    def __init__(self, input_video_dir: str, api_key: Optional[str] = None,
+                 use_cache: bool = True):
         """
         初始化批量处理器
         
         Args:
             input_video_dir: 原始视频目录路径
             api_key: DeepSeek API密钥
+            use_cache: 是否按SRT内容哈希缓存AI分析结果
         """
         self.input_video_dir = Path(input_video_dir)
+        self.use_cache = use_cache
         
         # 验证配置
         if not validate_config():
@@ -53,7 +72,8 @@ class BatchSRTToProductProcessor:
         self.logger.info(f"配置摘要: {config_summary}")
     
     def process_batch(self, srt_dir: Path, output_dir: str, 
-                     temp_dir: str = "data/temp") -> Tuple[Dict, Path]:
+                     temp_dir: str = "data/temp",
+                     max_workers: Optional[int] = None) -> Tuple[Dict, Path]:
         """
         批量处理SRT文件
         
@@ -61,6 +81,7 @@ class BatchSRTToProductProcessor:
             srt_dir: SRT文件目录
             output_dir: 输出视频目录
             temp_dir: 临时目录
+            max_workers: 并发处理的文件数，默认BATCH_MAX_WORKERS
             
         Returns:
             处理结果摘要
@@ -74,6 +95,9 @@ class BatchSRTToProductProcessor:
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # AI分析缓存：内容未变化的SRT不再重复调用DeepSeek
+        self.analysis_cache = AnalysisCache(self.temp_dir / 'ai_cache') if self.use_cache else None
+        
         self.logger.info("开始批量处理")
         self.logger.info(f"SRT目录: {srt_dir}")
         self.logger.info(f"输出目录: {self.output_dir}")
@@ -92,14 +116,20 @@ class BatchSRTToProductProcessor:
         )
         self.logger.info("视频生成器初始化完成")
             
-        for i, srt_file in enumerate(srt_files):
+        # 🚀 先统一清理旧产品介绍文件，避免并发时清理到其他文件刚生成的切片
+        for srt_file in srt_files:
+            self._clean_old_product_videos(srt_file.stem)
+        
+        def process_one(indexed_file):
+            i, srt_file = indexed_file
             self.logger.info(f"处理文件 {i+1}/{len(srt_files)}: {srt_file.name}")
-                
-            processing_result, video_results = self._process_file(
-                srt_file, video_generator
-            )
-            all_processing_results.append(processing_result)
-            all_video_results.extend(video_results)
+            return self._process_file(srt_file, video_generator)
+        
+        # 多个文件的AI请求与视频切片并发进行，结果保持输入顺序
+        with ThreadPoolExecutor(max_workers=max_workers or self.BATCH_MAX_WORKERS) as executor:
+            for processing_result, video_results in executor.map(process_one, enumerate(srt_files)):
+                all_processing_results.append(processing_result)
+                all_video_results.extend(video_results)
             
         # 生成并保存报告
         report = self._generate_report(all_processing_results, all_video_results, start_time)
@@ -114,18 +144,15 @@ class BatchSRTToProductProcessor:
         return report, report_path
 
     def _process_file(self, srt_file: Path, video_generator: 'VideoGenerator') -> Tuple[Dict, List[Dict]]:
-        """处理单个SRT文件，分析并为每个主题生成视频"""
+        """处理单个SRT文件，分析并为每个主题生成视频（旧产品文件由process_batch预先清理）"""
         
-        # 🚀 清理该视频的旧产品介绍文件，避免重复累积
-        self._clean_old_product_videos(srt_file.stem)
-        
-        # 1. 解析SRT
-        segments = self.srt_parser.parse_srt_file(srt_file)
+        # 1. 解析SRT（同一次读取中计算内容哈希，供AI分析缓存使用）
+        segments, srt_hash = self.srt_parser.parse_srt_file(srt_file, return_hash=True)
         if not segments:
             return {'filename': srt_file.name, 'success': False, 'error': 'SRT解析失败'}, []
 
-        # 2. AI分析所有主题
-        product_mentions = self.ai_analyzer.analyze_srt_content(segments, srt_file.name)
+        # 2. AI分析所有主题（优先命中缓存）
+        product_mentions = self._analyze_with_cache(srt_file, segments, srt_hash)
         if not product_mentions:
             return {'filename': srt_file.name, 'success': False, 'error': 'AI未识别到产品主题'}, []
         
@@ -180,39 +207,62 @@ class BatchSRTToProductProcessor:
         
         return processing_result, video_results
 
+    def _analyze_with_cache(self, srt_file: Path, segments: List, srt_hash: Optional[str]) -> List:
+        """调用AI分析SRT内容；启用缓存时按SRT内容哈希复用历史结果"""
+        if self.analysis_cache is None or srt_hash is None:
+            return self.ai_analyzer.analyze_srt_content(segments, srt_file.name)
+        
+        cache_key = AnalysisCache.make_key(srt_hash, self.ai_analyzer, srt_file.name)
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            self.logger.info(f"命中AI分析缓存: {srt_file.name}")
+            return cached
+        
+        product_mentions = self.ai_analyzer.analyze_srt_content(segments, srt_file.name)
+        # 空结果可能来自API失败，不写入缓存
+        if product_mentions:
+            self.analysis_cache.set(cache_key, product_mentions)
+        return product_mentions
+
     def _clean_old_product_videos(self, video_stem: str):
         """清理指定视频的旧产品介绍文件（视频+SRT）"""
         try:
-            # 清理视频文件
-            mp4_pattern = f"{video_stem}_*.mp4"
-            old_videos = list(self.output_dir.glob(mp4_pattern))
-            
-            # 清理SRT文件
-            srt_pattern = f"{video_stem}_*.srt"
-            old_srts = list(self.output_dir.glob(srt_pattern))
-            
-            old_files = old_videos + old_srts
+            # 单次扫描输出目录，匹配 {video_stem}_*.mp4 与 {video_stem}_*.srt
+            prefix = f"{video_stem}_"
+            with os.scandir(self.output_dir) as entries:
+                old_files = [
+                    entry for entry in entries
+                    if entry.name.startswith(prefix)
+                    and entry.name.endswith(('.mp4', '.srt'))
+                    and not entry.is_dir(follow_symlinks=False)
+                ]
             
             if old_files:
                 self.logger.info(f"清理{len(old_files)}个旧的产品文件...")
+                log_deletions = self.logger.isEnabledFor(logging.DEBUG)
                 for old_file in old_files:
-                    old_file.unlink()
-                    self.logger.debug(f"删除: {old_file.name}")
+                    os.unlink(old_file.path)
+                    if log_deletions:
+                        self.logger.debug(f"删除: {old_file.name}")
             
         except Exception as e:
             self.logger.warning(f"清理旧文件时出错: {e}")
 
     def _scan_srt_files(self, srt_dir: Path) -> List[Path]:
         """扫描目录下的SRT文件（递归扫描子目录）"""
-        # 🔍 递归搜索所有SRT文件，包括子目录
-        srt_files = list(srt_dir.rglob('*.srt'))
+        # 🔍 递归搜索所有SRT文件，包括子目录（os.walk只为.srt文件构造Path，不跟随目录符号链接）
+        srt_files = [
+            Path(dirpath) / name
+            for dirpath, _, filenames in os.walk(srt_dir)
+            for name in filenames
+            if name.endswith('.srt')
+        ]
         
         # 🚫 过滤掉已经是产品切片的SRT文件，避免重复处理和时间戳错误
         filtered_files = []
         for srt_file in srt_files:
             # 排除包含产品主题名称的切片文件
-            exclude_keywords = ['启赋蕴淳', '启赋水奶', '启赋蓝钻', '_product', '产品介绍', '核心配方', '便携']
-            if any(keyword in srt_file.name for keyword in exclude_keywords):
+            if _EXCLUDE_RE.search(srt_file.name):
                 self.logger.info(f"跳过产品切片SRT文件: {srt_file.name}")
                 continue
                 
@@ -300,11 +350,8 @@ class BatchSRTToProductProcessor:
         report_file = output_dir / report_filename
         
         try:
-            # 将ProductSegment对象转换为可序列化的字典
-            serializable_report = self._make_serializable(report)
-            
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(serializable_report, f, ensure_ascii=False, indent=2)
+            # ProductSegment对象在序列化过程中由default回调转换，无需预先遍历整个报告
+            dump_json(report_file, report, default=self._make_serializable)
             
             self.logger.info(f"报告已保存: {report_file}")
             return report_file
@@ -313,8 +360,9 @@ class BatchSRTToProductProcessor:
             self.logger.error(f"保存报告失败: {e}")
             return output_dir / "report_save_failed.txt"
     
-    def _make_serializable(self, obj):
-        """将对象转换为可JSON序列化的格式"""
+    @staticmethod
+    def _make_serializable(obj):
+        """JSON序列化default回调：将自定义对象（如ProductSegment）转换为字典"""
         if hasattr(obj, '__dict__'):
             # 处理自定义对象（如ProductSegment）
             return {
@@ -329,21 +377,16 @@ class BatchSRTToProductProcessor:
                 'logic_pattern': getattr(obj, 'logic_pattern', '其他'),
                 'scene_type': getattr(obj, 'scene_type', '未分类')
             }
-        elif isinstance(obj, dict):
-            return {k: self._make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_serializable(item) for item in obj]
-        else:
-            return obj
+        raise TypeError(f"无法序列化的对象类型: {type(obj).__name__}")
     
     def get_input_video_files(self) -> List[Path]:
         """获取输入视频目录中的视频文件列表"""
-        video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.wmv', '.flv']
+        # 单次扫描目录，按后缀集合过滤（大小写不敏感，避免逐个后缀重复枚举目录）
         video_files = []
-        
-        for ext in video_extensions:
-            video_files.extend(self.input_video_dir.glob(f'*{ext}'))
-            video_files.extend(self.input_video_dir.glob(f'*{ext.upper()}'))
+        with os.scandir(self.input_video_dir) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS and entry.is_file():
+                    video_files.append(self.input_video_dir / entry.name)
         
         return sorted(video_files)
     
@@ -369,21 +412,19 @@ class BatchSRTToProductProcessor:
         if not video_files:
             return {'valid': False, 'error': '原始视频目录中未找到视频文件'}
         
-        # 检查匹配情况
+        # 检查匹配情况（按文件名(stem)建立索引，同名视频取排序后的第一个）
+        video_by_stem = {}
+        for video_file in video_files:
+            video_by_stem.setdefault(video_file.stem, video_file)
+        
         matched_pairs = []
         unmatched_srt = []
         
         for srt_file in srt_files:
-            base_name = srt_file.stem
-            matched = False
-            
-            for video_file in video_files:
-                if video_file.stem == base_name:
-                    matched_pairs.append((srt_file.name, video_file.name))
-                    matched = True
-                    break
-            
-            if not matched:
+            video_file = video_by_stem.get(srt_file.stem)
+            if video_file is not None:
+                matched_pairs.append((srt_file.name, video_file.name))
+            else:
                 unmatched_srt.append(srt_file.name)
         
         return {
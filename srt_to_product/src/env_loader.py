@@ -5,6 +5,7 @@
 """
 
 import os
+import functools
 from dotenv import load_dotenv
 from typing import Optional
 
@@ -55,6 +56,9 @@ def get_brand_keywords() -> list:
                             '惠氏,启赋,蕴淳,蓝钻')
     return [keyword.strip() for keyword in keywords_str.split(',')]
 
+# 环境变量在导入时一次性加载，配置校验与摘要在进程内缓存；
+# 运行中修改了环境变量时调用 validate_config.cache_clear() / get_config_summary.cache_clear()
+@functools.lru_cache(maxsize=1)
 def validate_config() -> bool:
     """验证必需的配置是否完整"""
     api_key = get_deepseek_api_key()
@@ -62,8 +66,9 @@ def validate_config() -> bool:
         return False
     return True
 
+@functools.lru_cache(maxsize=1)
 def get_config_summary() -> dict:
-    """获取配置摘要"""
+    """获取配置摘要（缓存的共享字典，调用方不应修改）"""
     return {
         'api_configured': bool(get_deepseek_api_key()),
         'model': get_deepseek_model(),
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+JSON文件读写工具 - SRT转产品介绍视频
+优先使用orjson（C实现，直接产出UTF-8字节），未安装时回退到标准库json
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+# 可选依赖：orjson序列化速度远快于json.dump(indent=2)，且不构建中间str
+try:
+    import orjson  # type: ignore
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+
+def dump_json(path: Union[str, Path], obj: Any,
+              default: Optional[Callable[[Any], Any]] = None) -> None:
+    """
+    以2空格缩进、保留中文的格式写入JSON文件
+
+    Args:
+        path: 输出文件路径
+        obj: 要写入的数据
+        default: 无法直接序列化的对象的转换函数（与json.dump的default一致）
+    """
+    if _ORJSON_AVAILABLE:
+        try:
+            data = orjson.dumps(
+                obj, default=default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # orjson不支持的数据（如超过64位的整数）回退到标准库
+            data = None
+        if data is not None:
+            Path(path).write_bytes(data)
+            return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2, default=default)
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """读取JSON文件（优先使用orjson）"""
+    if _ORJSON_AVAILABLE:
+        raw = Path(path).read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # 标准库写出的NaN/Infinity等非严格JSON交给json模块解析
+            return json.loads(raw.decode('utf-8'))
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
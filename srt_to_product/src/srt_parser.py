@@ -5,6 +5,7 @@ SRT解析器 - SRT转产品介绍视频
 """
 
 import re
+import hashlib
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
@@ -27,28 +28,35 @@ class SRTParser:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def parse_srt_file(self, srt_path: Path) -> List[SRTSegment]:
+    def parse_srt_file(self, srt_path: Path, return_hash: bool = False):
         """
         解析SRT文件
         
         Args:
             srt_path: SRT文件路径
+            return_hash: 为True时同时返回文件内容的sha256摘要（同一次读取中计算，
+                供AI分析缓存使用，无需再次读取文件）
             
         Returns:
-            SRT片段列表
+            SRT片段列表；return_hash=True时返回(片段列表, sha256十六进制摘要或None)
         """
+        content_hash = None
         try:
-            with open(srt_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            data = Path(srt_path).read_bytes()
+            if return_hash:
+                content_hash = hashlib.sha256(data).hexdigest()
+            # 与文本模式读取一致：统一换行符为\n
+            content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
             
             segments = self._parse_srt_content(content)
             
             self.logger.info(f"成功解析SRT文件: {srt_path.name}, 共{len(segments)}个片段")
-            return segments
             
         except Exception as e:
             self.logger.error(f"解析SRT文件失败 {srt_path}: {e}")
-            return []
+            segments = []
+        
+        return (segments, content_hash) if return_hash else segments
     
     def _parse_srt_content(self, content: str) -> List[SRTSegment]:
         """解析SRT内容"""
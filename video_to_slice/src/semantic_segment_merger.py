@@ -249,7 +249,7 @@ class SemanticSegmentMerger:
                 
                 # 计算边缘特征
                 edges = cv2.Canny(gray, 50, 150)
-                edge_density = np.sum(edges > 0) / edges.size
+                edge_density = cv2.countNonZero(edges) / edges.size
                 
                 # 组合所有特征
                 frame_features = np.concatenate([